@@ -3,12 +3,12 @@ VOICE AGENT - WITH ML COMMAND CLASSIFIER
 Whisper MEDIUM + Command Classifier for improved accuracy
 """
 
-import json
-import os
+import argparse
 import sys
 import time
 import subprocess
 import signal
+import queue
 import re
 from datetime import datetime
 import warnings
@@ -56,86 +56,210 @@ def ensure_packages():
 ensure_packages()
 
 # Import everything
-import numpy as np
-import sounddevice as sd
 import soundfile as sf
-import keyboard
 import pyautogui
 from faster_whisper import WhisperModel
+from model_loader import BackgroundModelLoader, warmup_whisper
+from asr_cascade import CascadedTranscriber
+from nbest_asr import NBestTranscriber
+from vocab_bias import CommandVocabularyBias
+from app_index import AppNameIndex
+from pipeline import VoicePipeline
+from audio_capture import AudioCapture
+from streaming_asr import StreamingTranscriber
+from vad import EnergyVAD, UtteranceDetector
+from keyword_spotter import KeywordSpotter
+from memory_db import MemoryDB
+from tts import AudioCache, SpeechWorker, SilentBackend, make_backend
+from hotkey import KeyboardHotkey, PRESS, RELEASE, CLOSED
 
 # Import the classifier (from command_classifier.py)
 from command_classifier import CommandClassifier
 
 # ========================================================================
 class VoiceAgent:
-    def __init__(self):
+    # Constant replies, rendered once into the TTS audio cache
+    FIXED_RESPONSES = (
+        "Agent starting up with ML classifier.", "Agent stopped", "Check console for commands",
+        "Goodbye", "I'm not confident about that command. Can you repeat?", "Listening.",
+        "Locking computer", "No notes saved", "No pending tasks", "Please specify note number",
+        "Please specify task number", "Ready. Press F2 to talk.", "Restarting in 30 seconds",
+        "Screenshot taken", "Shutting down in 30 seconds",
+        "Still working on the last commands. Try again in a moment.", "Volume decreased",
+        "Volume increased", "Volume toggled", "What should I remember?", "What task?",
+        "Which application?"
+    )
+    
+    def __init__(self, hotkey_source=None, whisper_model=None, capture=None, **settings):
+        """
+        hotkey_source, whisper_model and capture stand in for the keyboard
+        hook, the Whisper load and the microphone (tests, headless runs);
+        any other keyword overrides the setting of that name below, e.g.
+        tts_backend="silent".
+        """
         print("\nInitializing Voice Agent...")
+        startup_start = time.perf_counter()
         
         # Settings
         self.hotkey = 'f2'
+        self.hotkey_source = hotkey_source    # None = KeyboardHotkey(self.hotkey)
         self.sample_rate = 16000
         self.channels = 1
+        self.max_record_seconds = 30          # longest utterance kept per press
+        self.overflow_policy = "drop_oldest"  # or "drop_newest"
+        self.persistent_stream = True         # keep the mic open between presses
+        self.preroll_seconds = 0.3            # audio kept from before the press
+        self.debug_save_audio = False         # also dump each utterance to a WAV
+        self.streaming_asr = False            # decode in chunks while F2 is held
+        self.stream_chunk_seconds = 1.0
+        self.decode_options = dict(language="en", beam_size=5, best_of=5, temperature=0.0)
+        self.asr_cascade = False              # greedy small model first, medium on doubt
+        self.fast_model_size = "base"
+        self.fast_decode_options = dict(language="en", beam_size=1, best_of=1, temperature=0.0)
+        self.vocabulary_bias = False          # prompt Whisper with command words + app names
+        self.nbest_rescoring = False          # pick among Whisper's N best by classifier confidence
+        self.nbest_hypotheses = 5
+        self.wake_word = None                 # hands-free: required first word
+        self.hands_free_reply_timeout = 30.0  # max wait for a reply to finish before listening again
+        self.keyword_spotting = False         # match enrolled fixed phrases before Whisper
+        self.keyword_dir = "keyword_templates"  # <phrase>/<n>.wav (python keyword_spotter.py --enroll ...)
+        # Phrases with these words always go through Whisper, never spot-only
+        self.keyword_whisper_only = ("shutdown", "shut", "restart", "reboot", "lock",
+                                     "delete", "remove", "exit", "quit", "goodbye", "bye")
+        self.tts_backend = "auto"             # "powershell", "pyttsx3" or "silent"
+        self.tts_cache_dir = "tts_cache"      # rendered fixed replies (None = always synthesize)
+        self.tts_cache_mb = 50
+        self.tts_prewarm_apps = 20            # "Opening <app>" replies rendered at startup
+        self.pipelined = True                 # decode/act on workers so F2 is never blocked
+        self.pipeline_queue_size = 2
+        
+        for name, value in settings.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+        if self.hotkey_source is None:
+            self.hotkey_source = KeyboardHotkey(self.hotkey)
+        self.whisper_model = whisper_model
+        self.capture = capture
         
         # Recording state
         self.is_recording = False
-        self.audio_frames = []
-        self.stream = None
         self.running = True
         
         # Initialize ML Classifier
         print("\nInitializing ML Command Classifier...")
         self.classifier = CommandClassifier()
+        self._init_command_handlers()
         
-        # Load models and data
+        # Load models and data (Whisper loads in the background meanwhile)
+        self._init_tts()
         self._init_whisper_medium()
         self._init_memory()
         self._init_apps()
+        self._prewarm_responses()
+        self._init_vocab_bias()
+        self._init_audio()
+        self._init_spotter()
+        self._wait_for_whisper()
+        self._init_streaming()
+        self._init_cascade()
+        self._init_nbest()
         
         self.speak("Agent starting up with ML classifier.")
         
-        print("\n✅ AGENT READY!")
+        # Ready = model loaded and warmed up, so the next command runs at steady state
+        print(f"\n✅ AGENT READY! (startup {time.perf_counter() - startup_start:.1f}s)")
         print(f"Hotkey: {self.hotkey.upper()} (press and hold)")
         print("Model: Whisper MEDIUM + ML Classifier")
         print("\nPress Ctrl+C to exit")
     
     # ====================================================================
-    # TTS - PowerShell based
-    def speak(self, text):
-        """Speak text using PowerShell"""
-        print(f"Agent: {text}")
+    # TTS - persistent speech worker
+    def _init_tts(self):
+        """One speech worker for the whole session, utterances spoken in order"""
+        cache = None
+        if self.tts_cache_dir:
+            cache = AudioCache(self.tts_cache_dir, max_bytes=self.tts_cache_mb * 1024 * 1024)
         try:
-            escaped_text = text.replace("'", "''")
-            command = f'PowerShell -Command "Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak(\'{escaped_text}\')"'
-            subprocess.Popen(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.tts = SpeechWorker(make_backend(self.tts_backend), cache=cache).start()
         except Exception as e:
-            print(f"⚠️ TTS error: {e}")
+            print(f"⚠️ TTS backend '{self.tts_backend}' unavailable ({e}), speaking silently")
+            self.tts = SpeechWorker(SilentBackend()).start()
+        print(f"✓ TTS: {self.tts.backend.name}")
+    
+    def _prewarm_responses(self):
+        """Render fixed and templated replies not yet in the audio cache"""
+        apps = list(self.apps)[:self.tts_prewarm_apps]
+        phrases = list(self.FIXED_RESPONSES) + [f"Opening {name}" for name in apps]
+        count = self.tts.prewarm(phrases)
+        if count:
+            print(f"  Rendering {count} replies into the TTS cache (background)")
+    
+    def speak(self, text):
+        """Queue text on the speech worker (returns immediately)"""
+        print(f"Agent: {text}")
+        self.tts.say(text)
     
     # ====================================================================
     # Whisper model - MEDIUM version
     def _init_whisper_medium(self):
-        print("\nLoading Whisper MEDIUM model...")
-        try:
-            self.whisper_model = WhisperModel(
-                "medium", device="cpu", compute_type="int8",
-                num_workers=1, cpu_threads=4
-            )
-            print("✓ Whisper MEDIUM loaded on CPU")
-        except Exception as e:
-            print(f"❌ Whisper failed: {e}")
-            sys.exit(1)
+        self.whisper_loader = None
+        if self.whisper_model is None:
+            print("\nLoading Whisper MEDIUM model (background)...")
+            self.whisper_loader = BackgroundModelLoader(
+                "whisper-medium",
+                lambda: WhisperModel(
+                    "medium", device="cpu", compute_type="int8",
+                    num_workers=1, cpu_threads=4
+                ),
+                warmup=lambda model: warmup_whisper(model, self.decode_options, self.sample_rate)
+            ).start()
+        self.fast_whisper_loader = None
+        if self.asr_cascade:
+            print(f"Loading Whisper {self.fast_model_size.upper()} model for the fast tier (background)...")
+            self.fast_whisper_loader = BackgroundModelLoader(
+                f"whisper-{self.fast_model_size}",
+                lambda: WhisperModel(
+                    self.fast_model_size, device="cpu", compute_type="int8",
+                    num_workers=1, cpu_threads=4
+                ),
+                warmup=lambda model: warmup_whisper(model, self.fast_decode_options, self.sample_rate)
+            ).start()
+    
+    def _wait_for_whisper(self):
+        if self.whisper_loader is not None:
+            try:
+                self.whisper_model = self.whisper_loader.get()
+            except Exception as e:
+                print(f"❌ Whisper failed: {e}")
+                sys.exit(1)
+            print(f"✓ Whisper MEDIUM loaded on CPU in {self.whisper_loader.load_seconds:.1f}s "
+                  f"(warm-up decode {self.whisper_loader.warmup_seconds:.1f}s)")
+        self.fast_whisper_model = None
+        if self.fast_whisper_loader is not None:
+            try:
+                self.fast_whisper_model = self.fast_whisper_loader.get()
+                print(f"✓ Whisper {self.fast_model_size.upper()} loaded in "
+                      f"{self.fast_whisper_loader.load_seconds:.1f}s "
+                      f"(warm-up decode {self.fast_whisper_loader.warmup_seconds:.1f}s)")
+            except Exception as e:
+                print(f"⚠️ Fast Whisper tier failed: {e} (cascade disabled)")
+                self.asr_cascade = False
     
     # ====================================================================
     # Memory
     def _init_memory(self):
+        """SQLite store shared with backend/server.js (agent_memory.json is imported once)"""
         self.memory_file = "agent_memory.json"
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, 'r') as f:
-                self.data = json.load(f)
-        else:
-            self.data = {"tasks": [], "notes": []}
-        print(f"✓ Memory loaded: {len(self.data['tasks'])} tasks, {len(self.data['notes'])} notes")
+        self.memory_db = "agent_memory.db"
+        self.memory = MemoryDB(self.memory_db)
+        migrated = self.memory.migrate_json(self.memory_file)
+        if migrated is not None:
+            print(f"  Migrated {migrated} items from {self.memory_file} into {self.memory_db}")
+        print(f"✓ Memory loaded: {self.memory.count_pending_tasks()} tasks, {self.memory.count_notes()} notes")
     
     def _init_apps(self):
+        self._user_apps = self.memory.apps()
         self.apps = {
             "notepad": "notepad.exe",
             "calculator": "calc.exe",
@@ -157,29 +281,60 @@ class VoiceAgent:
             "file explorer": "explorer",
             "task manager": "taskmgr",
             "control panel": "control",
-            "settings": "start ms-settings:"
+            "settings": "start ms-settings:",
+            **self._user_apps
         }
+        self.app_index = AppNameIndex(self.apps)
         print(f"✓ {len(self.apps)} apps available")
     
+    def _init_vocab_bias(self):
+        self.vocab_bias = CommandVocabularyBias(command_templates=self.classifier.command_templates, app_names=self.apps)
+    
+    def _refresh_user_apps(self):
+        """Reload apps if another process (e.g. the API server) changed the store"""
+        if not self.memory.changed_externally() or self.memory.apps() == self._user_apps:
+            return
+        self._init_apps()
+        if self.vocab_bias.update(app_names=self.apps):
+            print("  Vocabulary bias rebuilt for new apps")
+    
+    def _biased_options(self, options, limits=True):
+        """Decode options with the command-vocabulary bias (when enabled)"""
+        if not self.vocabulary_bias:
+            return options
+        self._refresh_user_apps()
+        return self.vocab_bias.apply(options, limits=limits)
+    
     # ====================================================================
     # Audio recording
-    def _audio_callback(self, indata, frames, time_info, status):
-        if self.is_recording:
-            self.audio_frames.append(indata.copy())
+    def _init_audio(self):
+        self.vad = EnergyVAD(self.sample_rate)
+        if self.capture is None:
+            self.capture = AudioCapture(
+                self.sample_rate, self.channels,
+                max_seconds=self.max_record_seconds,
+                overflow=self.overflow_policy,
+                preroll_seconds=self.preroll_seconds,
+                persistent=self.persistent_stream
+            )
+        if self.persistent_stream:
+            try:
+                self.capture.open()
+                print(f"✓ Microphone open ({self.preroll_seconds * 1000:.0f} ms pre-roll)")
+            except Exception as e:
+                print(f"⚠️ Mic error: {e} (falling back to opening per press)")
+                self.persistent_stream = False
+                self.capture.persistent = False
     
     def start_recording(self):
         if self.is_recording:
             return
         self.is_recording = True
-        self.audio_frames = []
+        self.tts.interrupt()   # barge-in: stop talking over (and into) the new command
         try:
-            self.stream = sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                callback=self._audio_callback,
-                dtype='float32'
-            )
-            self.stream.start()
+            self.capture.start()
+            if self.streaming_asr:
+                self.streamer.start(self.capture, self._biased_options(self.decode_options, limits=False))
             print("\n🎤 Recording... (speak now)")
         except Exception as e:
             print(f"Mic error: {e}")
@@ -190,30 +345,113 @@ class VoiceAgent:
             return None
         print("\n⏏️ Processing...")
         self.is_recording = False
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-        if not self.audio_frames:
+        audio = self.capture.stop()
+        if len(audio) == 0:
+            self.streamer.cancel()
             return None
-        audio = np.concatenate(self.audio_frames, axis=0)
-        if np.max(np.abs(audio)) < 0.005:
+        if self.capture.buffer.dropped_samples:
+            print(f"⚠️ Recording longer than {self.max_record_seconds}s, "
+                  f"{self.capture.buffer.dropped_samples / self.sample_rate:.1f}s dropped")
+        # The streamer indexes the untrimmed capture; trimming only applies without it
+        audio = self._prepare_audio(audio, trim=not self.streamer.active)
+        if audio is None:
+            self.streamer.cancel()
+        return audio
+    
+    def _prepare_audio(self, audio, trim=True):
+        """Mono-mix and VAD-gate a (samples, channels) clip; None if no speech"""
+        # Whisper wants 1-D mono; for one channel this is still a view
+        audio = audio[:, 0] if self.channels == 1 else audio.mean(axis=1)
+        speech, report = self.vad.process(audio)
+        if speech is None:
             print("No speech detected")
             return None
-        temp = f"temp_{int(time.time())}.wav"
-        sf.write(temp, audio, self.sample_rate)
-        return temp
+        if trim:
+            audio = speech
+            print(f"  VAD: kept {report['kept_seconds']:.2f}s of {report['original_seconds']:.2f}s "
+                  f"({report['saved_seconds']:.2f}s saved)")
+        if self.debug_save_audio:
+            debug_file = f"debug_{int(time.time())}.wav"
+            sf.write(debug_file, audio, self.sample_rate)
+            print(f"  Saved {debug_file}")
+        return audio
     
     # ====================================================================
     # Speech to text
-    def speech_to_text(self, audio_file):
-        try:
-            print("  Transcribing...")
-            segments, _ = self.whisper_model.transcribe(
-                audio_file, language="en",
-                beam_size=5, best_of=5, temperature=0.0
+    def _init_streaming(self):
+        self.streamer = StreamingTranscriber(
+            self.whisper_model, self.sample_rate,
+            chunk_seconds=self.stream_chunk_seconds,
+            decode_options=self.decode_options
+        )
+        self.streamer.subscribe(self.on_partial_transcript)
+    
+    def _init_cascade(self):
+        self.cascade = None
+        if self.asr_cascade:
+            self.cascade = CascadedTranscriber(
+                self.fast_whisper_model, self.whisper_model,
+                fast_options=self.fast_decode_options,
+                accurate_options=self.decode_options,
+                command_scorer=lambda text: self.classifier.classify_command(text)['confidence'],
+                min_command_confidence=self.classifier.final_decision_threshold
+            )
+    
+    def _init_nbest(self):
+        self.nbest = None
+        if self.nbest_rescoring:
+            self.nbest = NBestTranscriber(
+                self.whisper_model, self.classifier.classify_command,
+                num_hypotheses=self.nbest_hypotheses,
+                decode_options=self.decode_options
             )
-            text = " ".join([s.text for s in segments]).strip().lower()
+    
+    def _init_spotter(self):
+        self.spotter = None
+        if not self.keyword_spotting:
+            return
+        spotter = KeywordSpotter(self.sample_rate)
+        count = spotter.enroll_directory(self.keyword_dir)
+        if not count:
+            print(f"⚠️ Keyword spotting: no recordings in {self.keyword_dir}/, using Whisper only")
+            return
+        spotter.whisper_only = {label for label in spotter.templates
+                                if set(label.split()) & set(self.keyword_whisper_only)}
+        if spotter.whisper_only:
+            print(f"  Spotter defers to Whisper for: {', '.join(sorted(spotter.whisper_only))}")
+        spotter.calibrate()
+        self.spotter = spotter
+        print(f"✓ Keyword spotter: {len(spotter.templates)} phrases from {count} recordings")
+    
+    def speech_to_text(self, audio):
+        """Transcribe a float32 16 kHz mono array (a file path also works)"""
+        try:
+            # Enrolled fixed phrases skip Whisper entirely
+            if self.spotter is not None and not self.streamer.active and not isinstance(audio, str):
+                phrase, info = self.spotter.spot(audio)
+                if phrase is not None:
+                    print(f"🎯 Spotted in {info['seconds'] * 1000:.1f} ms (DTW {info['distance']:.2f})")
+                    print(f"📝 You said: {phrase}")
+                    return phrase
+            if self.streamer.active:
+                # Most of the clip was decoded while F2 was held
+                print("  Finalizing...")
+                text = self.streamer.finish(audio)
+            elif self.nbest is not None and not isinstance(audio, str):
+                print(f"  Transcribing ({self.nbest_hypotheses}-best)...")
+                text, info = self.nbest.transcribe(audio, bias=self._biased_options)
+                if info['asr_rank']:
+                    top = min(info['hypotheses'], key=lambda h: h['asr_rank'])
+                    print(f"  Rescored: hypothesis #{info['asr_rank'] + 1} beat Whisper's top guess '{top['text']}'")
+            elif self.cascade is not None:
+                print("  Transcribing (cascade)...")
+                text, info = self.cascade.transcribe(audio, bias=self._biased_options)
+                if info['tier'] == 'accurate':
+                    print(f"  Escalated to MEDIUM ({info['reason']}), fast tier heard: '{info['fast_text']}'")
+            else:
+                print("  Transcribing...")
+                segments, _ = self.whisper_model.transcribe(audio, **self._biased_options(self.decode_options))
+                text = " ".join([s.text for s in segments]).strip().lower()
             if text:
                 print(f"📝 You said: {text}")
                 return text
@@ -228,45 +466,37 @@ class VoiceAgent:
     # APPLICATION CONTROL
     def open_application(self, app_name):
         app_name = app_name.lower().strip()
-        if app_name in self.apps:
-            subprocess.Popen(self.apps[app_name], shell=True)
-            self.speak(f"Opening {app_name}")
-            return True
-        for key, cmd in self.apps.items():
-            if key in app_name or app_name in key:
-                subprocess.Popen(cmd, shell=True)
-                self.speak(f"Opening {key}")
-                return True
-        self.speak(f"Couldn't find '{app_name}'")
-        return False
+        matches = self.app_index.lookup(app_name)
+        if not matches:
+            self.speak(f"Couldn't find '{app_name}'")
+            return False
+        name, similarity = matches[0]
+        if similarity < 1.0:
+            print(f"  '{app_name}' matched {name} ({similarity:.2f}), alternatives: {matches[1:]}")
+        subprocess.Popen(self.apps[name], shell=True)
+        self.speak(f"Opening {name}")
+        return True
     
     # ====================================================================
     # TASK MANAGEMENT
     def add_task(self, task_text):
-        self.data["tasks"].append({
-            "task": task_text, "done": False,
-            "added": datetime.now().isoformat()
-        })
-        self._save_memory()
+        self.memory.add_task(task_text)
         self.speak(f"Added task: {task_text}")
     
     def show_tasks(self):
-        tasks = [t for t in self.data["tasks"] if not t.get("done")]
-        if tasks:
-            self.speak(f"You have {len(tasks)} tasks")
-            for i, t in enumerate(tasks[:5], 1):
+        count = self.memory.count_pending_tasks()
+        if count:
+            self.speak(f"You have {count} tasks")
+            for i, t in enumerate(self.memory.pending_tasks(limit=5), 1):
                 self.speak(f"{i}. {t['task']}")
         else:
             self.speak("No pending tasks")
     
     def complete_task(self, task_num):
         try:
-            num = int(task_num) - 1
-            tasks = [t for t in self.data["tasks"] if not t.get("done")]
-            if 0 <= num < len(tasks):
-                tasks[num]["done"] = True
-                self._save_memory()
-                self.speak(f"Completed: {tasks[num]['task']}")
+            task = self.memory.complete_task(int(task_num))
+            if task is not None:
+                self.speak(f"Completed: {task['task']}")
                 return True
             else:
                 self.speak(f"Task {task_num} not found")
@@ -277,12 +507,8 @@ class VoiceAgent:
     
     def delete_task(self, task_num):
         try:
-            num = int(task_num) - 1
-            pending = [t for t in self.data["tasks"] if not t.get("done")]
-            if 0 <= num < len(pending):
-                task = pending[num]
-                self.data["tasks"] = [t for t in self.data["tasks"] if t != task]
-                self._save_memory()
+            task = self.memory.delete_task(int(task_num))
+            if task is not None:
                 self.speak(f"Deleted task: {task['task']}")
                 return True
             else:
@@ -295,29 +521,22 @@ class VoiceAgent:
     # ====================================================================
     # NOTES MANAGEMENT
     def add_note(self, note_text):
-        if "notes" not in self.data:
-            self.data["notes"] = []
-        self.data["notes"].append({"note": note_text, "time": datetime.now().isoformat()})
-        self._save_memory()
+        self.memory.add_note(note_text)
         self.speak(f"Remembered: {note_text[:50]}")
     
     def show_notes(self):
-        notes = self.data.get("notes", [])
-        if notes:
-            count = len(notes)
+        count = self.memory.count_notes()
+        if count:
             self.speak(f"You have {count} notes")
-            for i, n in enumerate(notes[-5:], 1):
+            for i, n in enumerate(self.memory.recent_notes(5), 1):
                 self.speak(f"{i}. {n['note'][:50]}")
         else:
             self.speak("No notes saved")
     
     def delete_note(self, note_num):
         try:
-            num = int(note_num) - 1
-            notes = self.data.get("notes", [])
-            if 0 <= num < len(notes):
-                deleted = notes.pop(num)
-                self._save_memory()
+            deleted = self.memory.delete_note(int(note_num))
+            if deleted is not None:
                 self.speak(f"Deleted note: {deleted['note'][:50]}")
                 return True
             else:
@@ -329,11 +548,19 @@ class VoiceAgent:
     
     # ====================================================================
     # ML CLASSIFIER INTEGRATION (NEW)
+    def on_partial_transcript(self, text):
+        """Streaming ASR listener: show the running hypothesis and its likely command"""
+        guess = self.classifier.classify_command(text)
+        print(f"  … {text}  [{guess['command'] or '?'} {guess['confidence']:.2f}]")
+    
     def classify_and_execute(self, transcribed_text):
         """
         Use ML classifier to validate command, then execute
         """
-        # Get classification
+        return self.execute_classified(self.classify(transcribed_text))
+    
+    def classify(self, transcribed_text):
+        """Run the ML classifier and log its decision"""
         classification = self.classifier.classify_command(transcribed_text)
         
         print(f"\n[ML CLASSIFIER]")
@@ -341,114 +568,92 @@ class VoiceAgent:
         print(f"  Confidence: {classification['confidence']:.2f}")
         print(f"  Valid: {classification['is_valid']}")
         print(f"  Reason: {classification['reasoning']}")
-        
+        return classification
+    
+    def _init_command_handlers(self):
+        """Intent -> handler(slots) table used by execute_classified"""
+        self.command_handlers = {
+            'open': self._handle_open,
+            'add_task': self._handle_add_task,
+            'show_tasks': lambda slots: self.show_tasks(),
+            'complete_task': lambda slots: self.complete_task(slots.get('number')),
+            'delete_task': lambda slots: self.delete_task(slots.get('number')),
+            'remember': self._handle_remember,
+            'show_notes': lambda slots: self.show_notes(),
+            'delete_note': lambda slots: self.delete_note(slots.get('number')),
+            'volume_up': lambda slots: self._press_media_key(0xAF, 3, "Volume increased"),
+            'volume_down': lambda slots: self._press_media_key(0xAE, 3, "Volume decreased"),
+            'mute': lambda slots: self._press_media_key(0xAD, 1, "Volume toggled"),
+            'screenshot': lambda slots: self.take_screenshot(),
+            'lock': lambda slots: self._run_system("rundll32.exe user32.dll,LockWorkStation",
+                                                   "Locking computer"),
+            'shutdown': lambda slots: self._run_system("shutdown /s /t 30",
+                                                       "Shutting down in 30 seconds", speak_first=True),
+            'restart': lambda slots: self._run_system("shutdown /r /t 30",
+                                                      "Restarting in 30 seconds", speak_first=True),
+            'time': lambda slots: self.speak(f"The time is {datetime.now().strftime('%I:%M %p')}"),
+            'date': lambda slots: self.speak(f"Today is {datetime.now().strftime('%B %d, %Y')}"),
+            'help': lambda slots: self.show_help(),
+            'exit': self._handle_exit,
+        }
+    
+    def execute_classified(self, classification):
+        """Execute a classified command (low-confidence ones are rejected)"""
         # If not valid, reject
         if not classification['is_valid']:
             self.speak("I'm not confident about that command. Can you repeat?")
             return False
         
-        command = classification['command']
-        confidence = classification['confidence']
-        processed_text = classification['processed_text']
-        
-        # Execute based on classified command
-        if command == 'open':
-            match = re.search(r'open\s+(\w+)', processed_text)
-            if match:
-                app = match.group(1).strip()
-                self.open_application(app)
-        
-        elif command == 'add_task':
-            match = re.search(r'add\s+task\s+(.*)', processed_text)
-            if match:
-                task = match.group(1).strip()
-                if task:
-                    self.add_task(task)
-                else:
-                    self.speak("What task?")
-        
-        elif command == 'show_tasks':
-            self.show_tasks()
-        
-        elif command == 'complete_task':
-            match = re.search(r'complete\s+task\s+(\d+)', processed_text)
-            if match:
-                self.complete_task(match.group(1))
-        
-        elif command == 'delete_task':
-            match = re.search(r'delete\s+task\s+(\d+)', processed_text)
-            if match:
-                self.delete_task(match.group(1))
-        
-        elif command == 'remember':
-            match = re.search(r'remember\s+(.*)', processed_text)
-            if match:
-                note = match.group(1).strip()
-                if note:
-                    self.add_note(note)
-                else:
-                    self.speak("What should I remember?")
-        
-        elif command == 'show_notes':
-            self.show_notes()
-        
-        elif command == 'delete_note':
-            match = re.search(r'delete\s+note\s+(\d+)', processed_text)
-            if match:
-                self.delete_note(match.group(1))
-        
-        elif command == 'volume_up':
-            import ctypes
-            for _ in range(3):
-                ctypes.windll.user32.keybd_event(0xAF, 0, 0, 0)
-                ctypes.windll.user32.keybd_event(0xAF, 0, 2, 0)
-            self.speak("Volume increased")
-        
-        elif command == 'volume_down':
-            import ctypes
-            for _ in range(3):
-                ctypes.windll.user32.keybd_event(0xAE, 0, 0, 0)
-                ctypes.windll.user32.keybd_event(0xAE, 0, 2, 0)
-            self.speak("Volume decreased")
-        
-        elif command == 'mute':
-            import ctypes
-            ctypes.windll.user32.keybd_event(0xAD, 0, 0, 0)
-            ctypes.windll.user32.keybd_event(0xAD, 0, 2, 0)
-            self.speak("Volume toggled")
-        
-        elif command == 'screenshot':
-            filename = f"screenshot_{int(time.time())}.png"
-            pyautogui.screenshot(filename)
-            self.speak("Screenshot taken")
-        
-        elif command == 'lock':
-            subprocess.run("rundll32.exe user32.dll,LockWorkStation", shell=True)
-            self.speak("Locking computer")
-        
-        elif command == 'shutdown':
-            self.speak("Shutting down in 30 seconds")
-            subprocess.run("shutdown /s /t 30", shell=True)
-        
-        elif command == 'restart':
-            self.speak("Restarting in 30 seconds")
-            subprocess.run("shutdown /r /t 30", shell=True)
-        
-        elif command == 'time':
-            self.speak(f"The time is {datetime.now().strftime('%I:%M %p')}")
-        
-        elif command == 'date':
-            self.speak(f"Today is {datetime.now().strftime('%B %d, %Y')}")
-        
-        elif command == 'help':
-            self.show_help()
-        
-        elif command == 'exit':
-            self.speak("Goodbye")
+        # Arguments come from the classifier's own match (slots), not a second regex
+        handler = self.command_handlers.get(classification['command'])
+        if handler is None:
+            print(f"⚠️ No handler for command '{classification['command']}'")
+            return True
+        if handler(classification.get('slots', {})) == "exit":
             return "exit"
-        
         return True
     
+    def _handle_open(self, slots):
+        if slots.get('app'):
+            self.open_application(slots['app'])
+        else:
+            self.speak("Which application?")
+    
+    def _handle_add_task(self, slots):
+        if slots.get('task'):
+            self.add_task(slots['task'])
+        else:
+            self.speak("What task?")
+    
+    def _handle_remember(self, slots):
+        if slots.get('note'):
+            self.add_note(slots['note'])
+        else:
+            self.speak("What should I remember?")
+    
+    def _handle_exit(self, slots):
+        self.speak("Goodbye")
+        return "exit"
+    
+    def _press_media_key(self, key_code, presses, message):
+        import ctypes
+        for _ in range(presses):
+            ctypes.windll.user32.keybd_event(key_code, 0, 0, 0)
+            ctypes.windll.user32.keybd_event(key_code, 0, 2, 0)
+        self.speak(message)
+    
+    def take_screenshot(self):
+        filename = f"screenshot_{int(time.time())}.png"
+        pyautogui.screenshot(filename)
+        self.speak("Screenshot taken")
+    
+    def _run_system(self, command, message, speak_first=False):
+        if speak_first:
+            self.speak(message)
+        subprocess.run(command, shell=True)
+        if not speak_first:
+            self.speak(message)
+    
     def show_help(self):
         print("\n" + "="*60)
         print("COMMANDS")
@@ -463,10 +668,6 @@ class VoiceAgent:
         print("="*60)
         self.speak("Check console for commands")
     
-    def _save_memory(self):
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
-    
     # ====================================================================
     # MAIN LOOP
     def run(self):
@@ -476,37 +677,160 @@ class VoiceAgent:
         print("Press Ctrl+C to exit")
         print("="*60 + "\n")
         
+        # Streaming keeps per-utterance decoder state, so it stays on the serial path
+        pipeline = self._start_pipeline() if self.pipelined and not self.streaming_asr else None
         self.speak("Ready. Press F2 to talk.")
-        recording = False
+        self.hotkey_source.start()
         
         try:
             while self.running:
-                if keyboard.is_pressed(self.hotkey):
-                    if not recording:
-                        recording = True
-                        self.start_recording()
-                    time.sleep(0.1)
-                else:
-                    if recording:
-                        recording = False
-                        audio_file = self.stop_recording()
-                        if audio_file:
-                            text = self.speech_to_text(audio_file)
-                            if text:
-                                result = self.classify_and_execute(text)
-                                if result == "exit":
-                                    break
-                            try:
-                                os.remove(audio_file)
-                            except:
-                                pass
-                time.sleep(0.05)
+                # Blocks until F2 changes state (the timeout only lets Ctrl+C through)
+                event = self.hotkey_source.wait(timeout=0.5)
+                if event == PRESS:
+                    self.start_recording()
+                elif event == RELEASE:
+                    audio = self.stop_recording()
+                    if audio is not None and pipeline is not None:
+                        self._submit_utterance(pipeline, audio)
+                    elif audio is not None:
+                        text = self.speech_to_text(audio)
+                        if text:
+                            result = self.classify_and_execute(text)
+                            if result == "exit":
+                                break
+                elif event == CLOSED:
+                    if pipeline is not None:
+                        pipeline.stop(drain=True)
+                    break
+                if pipeline is not None and pipeline.exit_requested.is_set():
+                    break
         except KeyboardInterrupt:
             pass
         finally:
-            self.speak("Agent stopped")
-            print("\nGoodbye!")
+            self.hotkey_source.stop()
+            if pipeline is not None:
+                pipeline.stop(drain=False)
+            self._shutdown()
+    
+    def _start_pipeline(self):
+        """Capture stays on the hotkey loop; later stages get a worker each"""
+        return VoicePipeline([
+            ("asr", self.speech_to_text),
+            ("classify", self.classify),
+            ("act", self.execute_classified)
+        ], queue_size=self.pipeline_queue_size).start()
+    
+    def _submit_utterance(self, pipeline, audio):
+        if audio.base is not None:
+            # Still a view of the capture buffer, which the next press reuses
+            audio = audio.copy()
+        if not pipeline.submit(audio):
+            self.speak("Still working on the last commands. Try again in a moment.")
+
+    def run_hands_free(self):
+        """Continuous listening: no hotkey, Whisper only wakes for detected utterances"""
+        print("\n" + "="*60)
+        print("AGENT RUNNING WITH ML CLASSIFIER (HANDS-FREE)")
+        if self.wake_word:
+            print(f"Start commands with '{self.wake_word}'")
+        print("Press Ctrl+C to exit")
+        print("="*60 + "\n")
+        
+        if not self.capture.is_open:
+            self.capture.persistent = True
+            self.capture.open()
+        listener = UtteranceDetector(self.sample_rate, self.channels, preroll_seconds=self.preroll_seconds)
+        self.capture.on_block = listener.feed
+        
+        try:
+            listener.enabled = False
+            self.speak("Listening.")
+            self._resume_listening(listener)
+            while self.running:
+                try:
+                    # Timeout only so Ctrl+C is noticed; idle cost is the block gate
+                    clip = listener.utterances.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                # Deaf until our own reply has been spoken, or it becomes the next command
+                listener.enabled = False
+                try:
+                    audio = self._prepare_audio(clip)
+                    if audio is None:
+                        continue
+                    text = self.speech_to_text(audio)
+                    text = self._strip_wake_word(text)
+                    if text:
+                        result = self.classify_and_execute(text)
+                        if result == "exit":
+                            break
+                finally:
+                    self._resume_listening(listener)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.capture.on_block = None
+            self._shutdown()
+    
+    def _resume_listening(self, listener):
+        """Wait for queued speech to finish, then listen from a clean slate"""
+        self.tts.wait_idle(timeout=self.hands_free_reply_timeout)
+        listener.reset()
+        listener.enabled = True
+    
+    def _shutdown(self):
+        self.capture.close()
+        if self.spotter is not None:
+            stats = self.spotter.get_stats()
+            if stats['mean_ms'] is not None:
+                print(f"\nKeyword spotter: {stats['spotted']} spotted, {stats['fallbacks']} sent to Whisper "
+                      f"({stats['mean_ms']:.1f} ms per check)")
+        if self.nbest is not None:
+            stats = self.nbest.get_stats()
+            print(f"\nN-best rescoring: {stats['reranked']}/{stats['utterances']} changed by the classifier")
+        if self.cascade is not None:
+            stats = self.cascade.get_stats()
+            print(f"\nASR cascade: {stats['escalations']}/{stats['utterances']} escalated "
+                  f"({stats['escalation_rate']:.0%}), reasons {stats['escalation_reasons']}")
+            for tier in ("fast", "accurate"):
+                latency = stats[f'{tier}_latency']
+                if latency['count']:
+                    print(f"  {tier:<8} n={latency['count']} mean {latency['mean'] * 1000:.0f} ms "
+                          f"p50 {latency['p50'] * 1000:.0f} ms p90 {latency['p90'] * 1000:.0f} ms")
+        self.memory.close()
+        self.speak("Agent stopped")
+        self.tts.close()
+        stats = self.tts.get_stats()
+        first_audio = stats['time_to_first_audio']
+        if first_audio['count']:
+            print(f"\nTTS ({stats['backend']}): {stats['spoken']} utterances ({stats['from_cache']} from cache), "
+                  f"time to first audio mean {first_audio['mean'] * 1000:.0f} ms p90 {first_audio['p90'] * 1000:.0f} ms")
+        if stats['interrupts']:
+            print(f"  barge-in: {stats['interrupts']} interrupts, {stats['cut_short']} replies cut short, "
+                  f"{stats['stale_dropped']} dropped unspoken")
+        print("\nGoodbye!")
+    
+    def _strip_wake_word(self, text):
+        """Return the command after the wake word, or None if it is missing"""
+        if not text or not self.wake_word:
+            return text
+        words = re.sub(r'[^\w\s]', ' ', text).split()
+        wake = self.wake_word.lower().split()
+        if words[:len(wake)] != wake:
+            print(f"  (ignored, no wake word '{self.wake_word}')")
+            return None
+        return " ".join(words[len(wake):]) or None
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voice agent")
+    parser.add_argument("--mode", choices=["ptt", "handsfree"], default="ptt",
+                        help="push-to-talk on F2 (default) or hands-free continuous listening")
+    parser.add_argument("--wake-word", help="hands-free: only act on utterances starting with this word")
+    args = parser.parse_args()
+    
     agent = VoiceAgent()
-    agent.run()
+    agent.wake_word = args.wake_word
+    if args.mode == "handsfree":
+        agent.run_hands_free()
+    else:
+        agent.run()
@@ -0,0 +1,163 @@
+"""
+APP INDEX - Fuzzy application-name lookup for "open <app>"
+Names (and optional aliases) are normalized and indexed by character
+trigrams. A lookup only edit-distance-ranks the few names that share the
+most trigrams with the spoken name, so it stays fast with thousands of
+user-registered apps and never depends on dict order. Tiny lists are
+scanned instead, and results for recently spoken names are cached.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+
+def normalize_name(name):
+    """Lowercase, punctuation to spaces, single spaces ("VS-Code " -> "vs code")"""
+    return " ".join(re.sub(r"[^\w]+", " ", name.lower()).split())
+
+
+def levenshtein(a, b, max_distance=None):
+    """
+    Edit distance (Myers/Hyyro bit-parallel: one pass over the longer string
+    with the shorter one as bit masks). Distances above max_distance are
+    returned as max_distance + 1.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+    # Bit masks over the shorter string, scanned along the longer one
+    masks = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    last = 1 << (len(b) - 1)
+    positive, negative, distance = full, 0, len(b)
+    for char in a:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        ph = negative | (~(xh | positive) & full)
+        mh = positive & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        positive = mh | (~(xv | ph) & full)
+        negative = ph & xv
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+class AppNameIndex:
+    """
+    Trigram index + ranked edit-distance matching over app names
+
+    lookup("note pad") -> [(name, similarity), ...] best first, where
+    similarity = 1 - edit distance / longer length (spaces ignored), raised
+    for whole-word containment ("studio code" in "visual studio code",
+    "chrome" in "chrome please") and prefixes ("note" -> "notepad").
+
+    Below `scan_below` names every name is edit-distance ranked (cheaper
+    than gathering trigram candidates only for a handful of names). The
+    last `cache_size` lookups are kept in an LRU cache until the next
+    build(): a user opens the same few apps over and over.
+    """
+
+    def __init__(self, apps=(), aliases=None, min_similarity=0.6, max_candidates=12,
+                 scan_below=8, cache_size=256):
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+        self.scan_below = scan_below
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.build(apps, aliases)
+
+    @staticmethod
+    def _trigrams(compact):
+        padded = f"  {compact} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def build(self, apps, aliases=None):
+        """Index app names (any iterable, e.g. the apps dict) plus {alias: app name}"""
+        self._keys = []            # (normalized key, compact key, app name)
+        self._exact = {}           # normalized or compact key -> app name
+        self._postings = defaultdict(list)
+        with self._cache_lock:
+            self._cache.clear()
+        entries = [(name, name) for name in apps]
+        entries += list((aliases or {}).items())
+        for key, name in entries:
+            normalized = normalize_name(key)
+            compact = normalized.replace(" ", "")
+            if not compact or normalized in self._exact:
+                continue
+            key_id = len(self._keys)
+            self._keys.append((normalized, compact, name))
+            self._exact[normalized] = name
+            self._exact.setdefault(compact, name)
+            for gram in self._trigrams(compact):
+                self._postings[gram].append(key_id)
+        return self
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _similarity(self, query, query_compact, key, key_compact):
+        longest = max(len(query_compact), len(key_compact))
+        max_distance = int(longest * (1 - self.min_similarity))
+        distance = levenshtein(query_compact, key_compact, max_distance)
+        similarity = 1 - distance / longest if distance <= max_distance else 0.0
+        # Whole-word containment either way, or a spoken prefix of the name
+        if len(query_compact) >= 3 and (f" {query} " in f" {key} " or key_compact.startswith(query_compact)):
+            similarity = max(similarity, 0.7 + 0.3 * len(query_compact) / len(key_compact))
+        elif len(key_compact) >= 3 and f" {key} " in f" {query} ":
+            similarity = max(similarity, 0.7 + 0.3 * len(key_compact) / len(query_compact))
+        return similarity
+
+    def lookup(self, name, limit=3):
+        """Best matching app names as [(app name, similarity)], best first"""
+        query = normalize_name(name)
+        query_compact = query.replace(" ", "")
+        if not query_compact:
+            return []
+        exact = self._exact.get(query) or self._exact.get(query_compact)
+        if exact is not None:
+            return [(exact, 1.0)]
+        with self._cache_lock:
+            ranked = self._cache.get((query, limit))
+            if ranked is not None:
+                self._cache.move_to_end((query, limit))
+                self.cache_hits += 1
+                return list(ranked)
+
+        if len(self._keys) < self.scan_below:
+            candidates = self._keys
+        else:
+            shared = Counter()
+            for gram in self._trigrams(query_compact):
+                shared.update(self._postings.get(gram, ()))
+            candidates = [self._keys[key_id] for key_id, _ in shared.most_common(self.max_candidates)]
+        matches = {}
+        for key, key_compact, app in candidates:
+            similarity = self._similarity(query, query_compact, key, key_compact)
+            if similarity >= self.min_similarity and similarity > matches.get(app, (0.0,))[0]:
+                matches[app] = (similarity, len(key_compact))
+        ranked = sorted(matches.items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+        ranked = [(app, similarity) for app, (similarity, _) in ranked[:limit]]
+        with self._cache_lock:
+            self.cache_misses += 1
+            if self.cache_size > 0:
+                self._cache[(query, limit)] = ranked
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return list(ranked)
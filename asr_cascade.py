@@ -0,0 +1,120 @@
+"""
+ASR CASCADE - Fast greedy Whisper first, accurate beam search on doubt
+Short commands like "volume up" rarely need the medium model with beam
+search. The fast tier decodes greedily with a small/base model; the result
+is only re-decoded by the accurate tier when the fast decode looks unsure.
+"""
+
+import time
+from collections import deque
+
+
+class CascadedTranscriber:
+    """
+    Two-tier transcription with confidence-based escalation
+
+    The fast result is escalated when:
+      - it is empty,
+      - its duration-weighted segment avg_logprob < min_avg_logprob,
+      - any segment's no_speech_prob > max_no_speech_prob, or
+      - command_scorer(text) < min_command_confidence (optional hook, e.g.
+        the CommandClassifier confidence)
+
+    Escalation rate and per-tier latency are tracked for tuning.
+    """
+
+    def __init__(self, fast_model, accurate_model, fast_options=None, accurate_options=None,
+                 min_avg_logprob=-0.5, max_no_speech_prob=0.6,
+                 command_scorer=None, min_command_confidence=0.70, history=200):
+        self.fast_model = fast_model
+        self.accurate_model = accurate_model
+        self.fast_options = dict(fast_options or {"language": "en", "beam_size": 1, "temperature": 0.0})
+        self.accurate_options = dict(accurate_options or {"language": "en", "beam_size": 5, "temperature": 0.0})
+        self.min_avg_logprob = min_avg_logprob
+        self.max_no_speech_prob = max_no_speech_prob
+        self.command_scorer = command_scorer
+        self.min_command_confidence = min_command_confidence
+
+        self.utterances = 0
+        self.escalations = 0
+        self.escalation_reasons = {}
+        self.latency = {"fast": deque(maxlen=history), "accurate": deque(maxlen=history)}
+
+    @staticmethod
+    def _decode(model, audio, options):
+        """Run one decode; returns (text, avg_logprob, max_no_speech_prob)"""
+        segments, _ = model.transcribe(audio, **options)
+        segments = list(segments)
+        text = " ".join(s.text for s in segments).strip().lower()
+        if not segments:
+            return text, float("-inf"), 1.0
+        durations = [max(s.end - s.start, 1e-3) for s in segments]
+        avg_logprob = sum(s.avg_logprob * d for s, d in zip(segments, durations)) / sum(durations)
+        no_speech = max(s.no_speech_prob for s in segments)
+        return text, avg_logprob, no_speech
+
+    def _escalation_reason(self, text, avg_logprob, no_speech):
+        if not text:
+            return "empty"
+        if avg_logprob < self.min_avg_logprob:
+            return "avg_logprob"
+        if no_speech > self.max_no_speech_prob:
+            return "no_speech_prob"
+        if self.command_scorer is not None and self.command_scorer(text) < self.min_command_confidence:
+            return "command_confidence"
+        return None
+
+    def transcribe(self, audio, bias=None):
+        """
+        Transcribe with the cascade
+
+        bias: optional callable(options) -> options applied to both tiers
+        (e.g. CommandVocabularyBias.apply)
+
+        Returns (text, info) where info is
+        {'tier': 'fast' | 'accurate', 'reason': escalation reason or None,
+         'fast_text': fast-tier text, 'seconds': total decode time}
+        """
+        fast_options, accurate_options = self.fast_options, self.accurate_options
+        if bias is not None:
+            fast_options, accurate_options = bias(fast_options), bias(accurate_options)
+
+        self.utterances += 1
+        start = time.perf_counter()
+        fast_text, avg_logprob, no_speech = self._decode(self.fast_model, audio, fast_options)
+        fast_seconds = time.perf_counter() - start
+        self.latency["fast"].append(fast_seconds)
+
+        reason = self._escalation_reason(fast_text, avg_logprob, no_speech)
+        if reason is None:
+            return fast_text, {'tier': 'fast', 'reason': None, 'fast_text': fast_text, 'seconds': fast_seconds}
+
+        self.escalations += 1
+        self.escalation_reasons[reason] = self.escalation_reasons.get(reason, 0) + 1
+        accurate_start = time.perf_counter()
+        text, _, _ = self._decode(self.accurate_model, audio, accurate_options)
+        self.latency["accurate"].append(time.perf_counter() - accurate_start)
+        return text, {'tier': 'accurate', 'reason': reason, 'fast_text': fast_text,
+                      'seconds': time.perf_counter() - start}
+
+    def get_stats(self):
+        """Escalation rate and per-tier latency (seconds) over recent utterances"""
+        def summary(samples):
+            if not samples:
+                return {'count': 0, 'mean': None, 'p50': None, 'p90': None}
+            ordered = sorted(samples)
+            return {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+            }
+
+        return {
+            'utterances': self.utterances,
+            'escalations': self.escalations,
+            'escalation_rate': self.escalations / self.utterances if self.utterances else 0.0,
+            'escalation_reasons': dict(self.escalation_reasons),
+            'fast_latency': summary(self.latency["fast"]),
+            'accurate_latency': summary(self.latency["accurate"])
+        }
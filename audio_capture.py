@@ -0,0 +1,217 @@
+"""
+AUDIO CAPTURE - Preallocated buffers for microphone recording
+The PortAudio callback writes into a fixed float32 ring buffer in place,
+and the recorded utterance is handed off as a view (no concatenate/copy).
+"""
+
+import threading
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity float32 ring buffer for audio capture
+
+    The storage is mirrored (every sample is written twice, `capacity`
+    samples apart), so the most recent `capacity` samples are always one
+    contiguous slice and view() never has to copy, even after wrap-around.
+
+    Overflow policies (when more than max_seconds are written):
+        'drop_oldest' - keep the most recent max_seconds of audio
+        'drop_newest' - keep the first max_seconds, ignore the rest
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, sample_rate=16000, channels=1, max_seconds=30.0, overflow="drop_oldest"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r} "
+                             f"(expected one of {', '.join(self.OVERFLOW_POLICIES)})")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.overflow = overflow
+        self.capacity = max(1, int(round(sample_rate * max_seconds)))
+        self._storage = np.zeros((2 * self.capacity, channels), dtype=np.float32)
+        self._head = 0          # next write position in [0, capacity)
+        self._count = 0         # number of valid samples
+        self.total_written = 0  # samples accepted since reset (absolute position)
+        self.dropped_samples = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def duration(self):
+        """Seconds of audio currently held"""
+        return self._count / self.sample_rate
+
+    @property
+    def is_full(self):
+        return self._count >= self.capacity
+
+    def reset(self):
+        """Forget buffered audio (storage is reused, not reallocated)"""
+        self._head = 0
+        self._count = 0
+        self.total_written = 0
+        self.dropped_samples = 0
+
+    def write(self, block):
+        """Copy a (frames, channels) block into the buffer in place"""
+        frames = len(block)
+        if frames == 0:
+            return 0
+        position = self.total_written + frames
+
+        if self.overflow == "drop_newest":
+            room = self.capacity - self._count
+            if frames > room:
+                self.dropped_samples += frames - room
+                block = block[:room]
+                frames = room
+                position = self.total_written + frames
+            if frames == 0:
+                return 0
+        elif frames > self.capacity:
+            # Only the tail of an oversized block can survive
+            self.dropped_samples += frames - self.capacity
+            block = block[-self.capacity:]
+            frames = self.capacity
+
+        # Write into both mirrors, split where the primary copy wraps
+        first = min(frames, self.capacity - self._head)
+        for offset in (self._head, self._head + self.capacity):
+            self._storage[offset:offset + first] = block[:first]
+        rest = frames - first
+        if rest:
+            self._storage[:rest] = block[first:]
+            self._storage[self.capacity:self.capacity + rest] = block[first:]
+
+        self._head = (self._head + frames) % self.capacity
+        self.total_written = position
+        overflow = self._count + frames - self.capacity
+        if overflow > 0:
+            self.dropped_samples += overflow
+        self._count = min(self._count + frames, self.capacity)
+        return frames
+
+    def view(self):
+        """
+        Zero-copy (samples, channels) view of the buffered audio, oldest first
+
+        The view aliases the buffer storage: it is only valid until the next
+        reset()/write() that reuses that memory.
+        """
+        start = (self._head - self._count) % self.capacity
+        return self._storage[start:start + self._count]
+
+    def since(self, position):
+        """
+        View of the samples written at or after absolute `position`
+
+        Positions count samples since reset(); with 'drop_oldest' the
+        samples before total_written - len(self) are gone and are skipped.
+        """
+        skip = max(0, position - (self.total_written - self._count))
+        return self.view()[skip:]
+
+
+class AudioCapture:
+    """
+    Push-to-talk microphone capture
+
+    persistent=True  - one InputStream is opened up front and left running.
+                       While the gate is closed, blocks go to a short pre-roll
+                       ring; start() prepends that pre-roll to the utterance
+                       and opens the gate, so a press costs no device setup
+                       and the first syllables are not clipped.
+    persistent=False - the stream is opened on start() and closed on stop()
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, max_seconds=30.0,
+                 overflow="drop_oldest", preroll_seconds=0.3, persistent=True):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.persistent = persistent
+        self.buffer = AudioRingBuffer(sample_rate, channels, max_seconds, overflow)
+        self.preroll = None
+        if persistent and preroll_seconds > 0:
+            self.preroll = AudioRingBuffer(sample_rate, channels, preroll_seconds, "drop_oldest")
+        self.stream = None
+        self.on_block = None   # optional per-block hook, called on every block
+        self._gate = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.stream is not None
+
+    def _callback(self, indata, frames, time_info, status):
+        with self._lock:
+            if self._gate:
+                self.buffer.write(indata)
+            elif self.preroll is not None:
+                self.preroll.write(indata)
+        if self.on_block is not None:
+            self.on_block(indata)
+
+    def open(self):
+        """Open and start the input stream (no-op if already open)"""
+        if self.stream is not None:
+            return
+        import sounddevice as sd
+        stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            callback=self._callback,
+            dtype='float32'
+        )
+        stream.start()
+        self.stream = stream
+
+    def close(self):
+        """Stop and release the input stream"""
+        with self._lock:
+            self._gate = False
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def start(self):
+        """Begin an utterance (opens the gate)"""
+        with self._lock:
+            self.buffer.reset()
+            if self.preroll is not None:
+                self.buffer.write(self.preroll.view())
+                self.preroll.reset()
+            self._gate = True
+        if not self.persistent:
+            try:
+                self.open()
+            except Exception:
+                self._gate = False
+                raise
+
+    def read_since(self, position):
+        """
+        Copy of the audio captured at or after absolute `position`, plus the
+        position just past it. Safe to call while recording (the copy is
+        taken under the callback lock, so later writes cannot alias it).
+        """
+        with self._lock:
+            return self.buffer.since(position).copy(), self.buffer.total_written
+
+    def stop(self):
+        """
+        End the utterance and return it as a zero-copy (samples, channels) view
+
+        The view stays valid until the next start().
+        """
+        if self.persistent:
+            with self._lock:
+                self._gate = False
+        else:
+            self.close()
+        return self.buffer.view()
@@ -2,6 +2,7 @@ const express = require('express');
 const fs = require('fs');
 const path = require('path');
 const cors = require('cors');
+const { DatabaseSync } = require('node:sqlite');
 
 const app = express();
 const PORT = 5000;
@@ -10,31 +11,203 @@ const PORT = 5000;
 app.use(cors());
 app.use(express.json());
 
-// Path to agent memory (shared with Python agent)
+// SQLite store shared with the Python agent (memory_db.py). WAL lets the
+// agent and this server read and write concurrently without rewriting a file.
+// node:sqlite is built into Node >= 22.13, so there is no native module to build.
+const DB_FILE = path.join(__dirname, '../agent_memory.db');
+const db = new DatabaseSync(DB_FILE);
+db.exec('PRAGMA busy_timeout = 5000');
+db.exec('PRAGMA journal_mode = WAL');
+db.exec('PRAGMA synchronous = NORMAL');
+
+// Keep in sync with SCHEMA in memory_db.py
+db.exec(`
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    added TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (done, id);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    note TEXT NOT NULL,
+    time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apps (
+    name TEXT PRIMARY KEY,
+    command TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+`);
+
+const sql = {
+  allTasks: db.prepare('SELECT * FROM tasks ORDER BY id'),
+  pendingTasks: db.prepare('SELECT * FROM tasks WHERE done = 0 ORDER BY id'),
+  taskAt: db.prepare('SELECT * FROM tasks ORDER BY id LIMIT 1 OFFSET ?'),
+  addTask: db.prepare('INSERT INTO tasks (task, done, added) VALUES (?, 0, ?)'),
+  setTaskDone: db.prepare('UPDATE tasks SET done = ? WHERE id = ?'),
+  deleteTask: db.prepare('DELETE FROM tasks WHERE id = ?'),
+  allNotes: db.prepare('SELECT * FROM notes ORDER BY id'),
+  noteAt: db.prepare('SELECT * FROM notes ORDER BY id LIMIT 1 OFFSET ?'),
+  addNote: db.prepare('INSERT INTO notes (note, time) VALUES (?, ?)'),
+  deleteNote: db.prepare('DELETE FROM notes WHERE id = ?'),
+  stats: db.prepare(`SELECT
+    (SELECT COUNT(*) FROM tasks) AS totalTasks,
+    (SELECT COUNT(*) FROM tasks WHERE done = 1) AS completedTasks,
+    (SELECT COUNT(*) FROM tasks WHERE done = 0) AS pendingTasks,
+    (SELECT COUNT(*) FROM notes) AS totalNotes`)
+};
+
+// Rows in the shape the JSON file used (plus their id)
+const toTask = row => ({ id: row.id, task: row.task, done: Boolean(row.done), added: row.added });
+const toNote = row => ({ id: row.id, note: row.note, time: row.time });
+
+// :index is the position in the full list, as before the move to SQLite
+function rowAt(statement, index) {
+  const offset = Number(index);
+  if (!Number.isInteger(offset) || offset < 0) {
+    return undefined;
+  }
+  return statement.get(offset);
+}
+
+// Wrap fn in BEGIN IMMEDIATE / COMMIT (ROLLBACK if it throws)
+function transaction(fn) {
+  return (...args) => {
+    db.exec('BEGIN IMMEDIATE');
+    try {
+      const result = fn(...args);
+      db.exec('COMMIT');
+      return result;
+    } catch (error) {
+      db.exec('ROLLBACK');
+      throw error;
+    }
+  };
+}
+
+// Look up and change a row in one transaction, so a concurrent write by the
+// agent cannot shift the index in between
+const completeTaskAt = transaction((index, done) => {
+  const row = rowAt(sql.taskAt, index);
+  if (row) {
+    sql.setTaskDone.run(done ? 1 : 0, row.id);
+    row.done = done ? 1 : 0;
+  }
+  return row;
+});
+const deleteTaskAt = transaction(index => {
+  const row = rowAt(sql.taskAt, index);
+  if (row) {
+    sql.deleteTask.run(row.id);
+  }
+  return row;
+});
+const deleteNoteAt = transaction(index => {
+  const row = rowAt(sql.noteAt, index);
+  if (row) {
+    sql.deleteNote.run(row.id);
+  }
+  return row;
+});
+
+// ============================================================
+// ONE-TIME IMPORT OF agent_memory.json (same as MemoryDB.migrate_json)
+// ============================================================
+
 const MEMORY_FILE = path.join(__dirname, '../agent_memory.json');
+const JOURNAL_FILE = path.join(__dirname, '../agent_memory.journal.jsonl');
+
+// Replay one journal record onto the snapshot (same ops as memory_store._apply)
+function applyRecord(memory, record) {
+  const { op, table } = record;
+  if (op === 'add') {
+    memory[table] = memory[table] || [];
+    memory[table].push(record.item);
+  } else if (op === 'update') {
+    Object.assign(memory[table][record.index], record.fields);
+  } else if (op === 'delete') {
+    memory[table].splice(record.index, 1);
+  } else if (op === 'set') {
+    memory[table] = memory[table] || {};
+    memory[table][record.key] = record.value;
+  } else if (op === 'unset') {
+    delete (memory[table] || {})[record.key];
+  }
+}
 
-// Helper function to read memory
-function readMemory() {
-  try {
-    if (fs.existsSync(MEMORY_FILE)) {
-      const data = fs.readFileSync(MEMORY_FILE, 'utf8');
-      return JSON.parse(data);
+// Snapshot + journal, as the agent last left them
+function readJsonMemory() {
+  let memory = { tasks: [], notes: [], apps: {} };
+  if (fs.existsSync(MEMORY_FILE)) {
+    memory = { ...memory, ...JSON.parse(fs.readFileSync(MEMORY_FILE, 'utf8')) };
+  }
+  let seq = memory._seq || 0;
+  if (fs.existsSync(JOURNAL_FILE)) {
+    const lines = fs.readFileSync(JOURNAL_FILE, 'utf8').split('\n');
+    lines.pop();  // text after the last newline is an unfinished write
+    for (const line of lines) {
+      let record;
+      try {
+        record = JSON.parse(line);
+      } catch (error) {
+        break;    // torn write from a crash: drop it and what follows
+      }
+      if (record.seq > seq) {
+        applyRecord(memory, record);
+        seq = record.seq;
+      }
     }
-  } catch (error) {
-    console.error('Error reading memory:', error);
   }
-  return { tasks: [], notes: [] };
+  return memory;
 }
 
-// Helper function to write memory
-function writeMemory(data) {
-  try {
-    fs.writeFileSync(MEMORY_FILE, JSON.stringify(data, null, 2));
+const isMigrated = () => db.prepare("SELECT 1 FROM meta WHERE key = 'json_migrated'").get() !== undefined;
+
+// Import agent_memory.json (+ journal) once, so a server started before the
+// agent does not serve an empty database; returns the number of rows or null
+function migrateJson() {
+  if (isMigrated() || !(fs.existsSync(MEMORY_FILE) || fs.existsSync(JOURNAL_FILE))) {
+    return null;
+  }
+  const memory = readJsonMemory();
+  const imported = transaction(() => {
+    if (isMigrated()) {
+      return false;  // the agent migrated it meanwhile
+    }
+    const addTask = db.prepare('INSERT INTO tasks (task, done, added) VALUES (?, ?, ?)');
+    for (const t of memory.tasks || []) {
+      addTask.run(t.task, t.done ? 1 : 0, t.added || '');
+    }
+    const addNote = db.prepare('INSERT INTO notes (note, time) VALUES (?, ?)');
+    for (const n of memory.notes || []) {
+      addNote.run(n.note, n.time || '');
+    }
+    const setApp = db.prepare('INSERT OR REPLACE INTO apps (name, command) VALUES (?, ?)');
+    for (const [name, command] of Object.entries(memory.apps || {})) {
+      setApp.run(name, command);
+    }
+    db.prepare("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)").run(new Date().toISOString());
     return true;
-  } catch (error) {
-    console.error('Error writing memory:', error);
-    return false;
+  })();
+  if (!imported) {
+    return null;
   }
+  for (const file of [MEMORY_FILE, JOURNAL_FILE]) {
+    if (fs.existsSync(file)) {
+      fs.renameSync(file, file + '.migrated');
+    }
+  }
+  return (memory.tasks || []).length + (memory.notes || []).length + Object.keys(memory.apps || {}).length;
+}
+
+const migrated = migrateJson();
+if (migrated !== null) {
+  console.log(`Migrated ${migrated} rows from agent_memory.json into agent_memory.db`);
 }
 
 // ============================================================
@@ -43,16 +216,12 @@ function writeMemory(data) {
 
 // GET all tasks
 app.get('/api/tasks', (req, res) => {
-  const memory = readMemory();
-  const tasks = memory.tasks || [];
-  res.json(tasks);
+  res.json(sql.allTasks.all().map(toTask));
 });
 
 // GET pending tasks only
 app.get('/api/tasks/pending', (req, res) => {
-  const memory = readMemory();
-  const tasks = (memory.tasks || []).filter(t => !t.done);
-  res.json(tasks);
+  res.json(sql.pendingTasks.all().map(toTask));
 });
 
 // POST - Add new task
@@ -63,19 +232,12 @@ app.post('/api/tasks', (req, res) => {
     return res.status(400).json({ error: 'Task text required' });
   }
 
-  const memory = readMemory();
-  const newTask = {
-    task: task,
-    done: false,
-    added: new Date().toISOString()
-  };
-
-  memory.tasks = (memory.tasks || []);
-  memory.tasks.push(newTask);
-
-  if (writeMemory(memory)) {
-    res.status(201).json(newTask);
-  } else {
+  try {
+    const added = new Date().toISOString();
+    const result = sql.addTask.run(task, added);
+    res.status(201).json({ id: Number(result.lastInsertRowid), task: task, done: false, added: added });
+  } catch (error) {
+    console.error('Error saving task:', error);
     res.status(500).json({ error: 'Failed to save task' });
   }
 });
@@ -85,19 +247,14 @@ app.put('/api/tasks/:index', (req, res) => {
   const { index } = req.params;
   const { done } = req.body;
 
-  const memory = readMemory();
-  const tasks = memory.tasks || [];
-
-  if (index < 0 || index >= tasks.length) {
-    return res.status(404).json({ error: 'Task not found' });
-  }
-
-  tasks[index].done = done;
-  memory.tasks = tasks;
-
-  if (writeMemory(memory)) {
-    res.json(tasks[index]);
-  } else {
+  try {
+    const row = completeTaskAt(index, done);
+    if (!row) {
+      return res.status(404).json({ error: 'Task not found' });
+    }
+    res.json(toTask(row));
+  } catch (error) {
+    console.error('Error updating task:', error);
     res.status(500).json({ error: 'Failed to update task' });
   }
 });
@@ -106,19 +263,14 @@ app.put('/api/tasks/:index', (req, res) => {
 app.delete('/api/tasks/:index', (req, res) => {
   const { index } = req.params;
 
-  const memory = readMemory();
-  const tasks = memory.tasks || [];
-
-  if (index < 0 || index >= tasks.length) {
-    return res.status(404).json({ error: 'Task not found' });
-  }
-
-  const deleted = tasks.splice(index, 1);
-  memory.tasks = tasks;
-
-  if (writeMemory(memory)) {
-    res.json({ deleted: deleted[0] });
-  } else {
+  try {
+    const row = deleteTaskAt(index);
+    if (!row) {
+      return res.status(404).json({ error: 'Task not found' });
+    }
+    res.json({ deleted: toTask(row) });
+  } catch (error) {
+    console.error('Error deleting task:', error);
     res.status(500).json({ error: 'Failed to delete task' });
   }
 });
@@ -129,9 +281,7 @@ app.delete('/api/tasks/:index', (req, res) => {
 
 // GET all notes
 app.get('/api/notes', (req, res) => {
-  const memory = readMemory();
-  const notes = memory.notes || [];
-  res.json(notes);
+  res.json(sql.allNotes.all().map(toNote));
 });
 
 // POST - Add new note
@@ -142,18 +292,12 @@ app.post('/api/notes', (req, res) => {
     return res.status(400).json({ error: 'Note text required' });
   }
 
-  const memory = readMemory();
-  const newNote = {
-    note: note,
-    time: new Date().toISOString()
-  };
-
-  memory.notes = (memory.notes || []);
-  memory.notes.push(newNote);
-
-  if (writeMemory(memory)) {
-    res.status(201).json(newNote);
-  } else {
+  try {
+    const time = new Date().toISOString();
+    const result = sql.addNote.run(note, time);
+    res.status(201).json({ id: Number(result.lastInsertRowid), note: note, time: time });
+  } catch (error) {
+    console.error('Error saving note:', error);
     res.status(500).json({ error: 'Failed to save note' });
   }
 });
@@ -162,19 +306,14 @@ app.post('/api/notes', (req, res) => {
 app.delete('/api/notes/:index', (req, res) => {
   const { index } = req.params;
 
-  const memory = readMemory();
-  const notes = memory.notes || [];
-
-  if (index < 0 || index >= notes.length) {
-    return res.status(404).json({ error: 'Note not found' });
-  }
-
-  const deleted = notes.splice(index, 1);
-  memory.notes = notes;
-
-  if (writeMemory(memory)) {
-    res.json({ deleted: deleted[0] });
-  } else {
+  try {
+    const row = deleteNoteAt(index);
+    if (!row) {
+      return res.status(404).json({ error: 'Note not found' });
+    }
+    res.json({ deleted: toNote(row) });
+  } catch (error) {
+    console.error('Error deleting note:', error);
     res.status(500).json({ error: 'Failed to delete note' });
   }
 });
@@ -183,20 +322,9 @@ app.delete('/api/notes/:index', (req, res) => {
 // STATS ENDPOINT
 // ============================================================
 
-// GET statistics
+// GET statistics (counted by SQLite, not by loading every row)
 app.get('/api/stats', (req, res) => {
-  const memory = readMemory();
-  const tasks = memory.tasks || [];
-  const notes = memory.notes || [];
-  
-  const stats = {
-    totalTasks: tasks.length,
-    completedTasks: tasks.filter(t => t.done).length,
-    pendingTasks: tasks.filter(t => !t.done).length,
-    totalNotes: notes.length
-  };
-
-  res.json(stats);
+  res.json(sql.stats.get());
 });
 
 // ============================================================
@@ -0,0 +1,110 @@
+"""
+BENCHMARK - open_application name lookup at thousands of apps
+Compares the agent's previous linear scan (exact hit, then the first
+`key in name or name in key` entry in dict order) with AppNameIndex for
+10 to 20000 registered apps: an edit-distance scan of every name, the
+trigram index with its result cache off, and 100 of the queries repeated
+with the cache on (a user saying the same few app names). Queries are registered names
+with one typo, spoken prefixes and names with an extra word, as Whisper
+tends to produce them.
+
+Usage:
+    python benchmarks/bench_app_index.py [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_index import AppNameIndex
+
+SIZES = (10, 100, 1000, 5000, 20000)
+SCAN_MAX = 1000     # the full edit-distance scan gets too slow to time above this
+
+
+def linear_lookup(apps, app_name):
+    """open_application's matching before the index"""
+    if app_name in apps:
+        return app_name
+    for key in apps:
+        if key in app_name or app_name in key:
+            return key
+    return None
+
+
+def app_names(rng, count):
+    names = set()
+    while len(names) < count:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+                 for _ in range(rng.choice((1, 1, 2, 3)))]
+        names.add(" ".join(words))
+    return sorted(names)
+
+
+def spoken_variant(rng, name):
+    kind = rng.randrange(3)
+    if kind == 0 and len(name) > 4:
+        i = rng.randrange(len(name))
+        return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]   # one substitution
+    if kind == 1 and len(name) > 5:
+        return name[:max(4, len(name) - 2)]                                   # clipped ending
+    return name + " please"                                                 # extra word
+
+
+def main():
+    parser = argparse.ArgumentParser(description="App-name lookup benchmark")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"\n{'apps':>6} {'build':>9} {'linear':>11} {'scan':>11} {'indexed':>11} {'cached':>11} "
+          f"{'linear ok':>10} {'indexed ok':>11}")
+    for size in SIZES:
+        names = app_names(rng, size)
+        apps = {name: f"start {name.replace(' ', '')}" for name in names}
+        targets = [rng.choice(names) for _ in range(args.queries)]
+        queries = [spoken_variant(rng, name) for name in targets]
+
+        start = time.perf_counter()
+        index = AppNameIndex(apps, scan_below=0, cache_size=0)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear = [linear_lookup(apps, q) for q in queries]
+        linear_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        scan = "-"
+        if size <= SCAN_MAX:
+            scanner = AppNameIndex(apps, scan_below=size + 1, cache_size=0)
+            start = time.perf_counter()
+            for q in queries:
+                scanner.lookup(q)
+            scan = f"{(time.perf_counter() - start) / len(queries) * 1e6:.1f} µs"
+
+        start = time.perf_counter()
+        indexed = [index.lookup(q) for q in queries]
+        indexed_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        # A user's working set: the first 100 spoken forms, repeated (fits the cache)
+        cached_index = AppNameIndex(apps, scan_below=0)
+        repeated = queries[:100] * (len(queries) // 100 or 1)
+        for q in repeated[:100]:
+            cached_index.lookup(q)
+        start = time.perf_counter()
+        for q in repeated:
+            cached_index.lookup(q)
+        cached_us = (time.perf_counter() - start) / len(repeated) * 1e6
+
+        linear_ok = sum(hit == t for hit, t in zip(linear, targets)) / len(targets)
+        indexed_ok = sum(bool(hits) and hits[0][0] == t for hits, t in zip(indexed, targets)) / len(targets)
+        print(f"{size:>6} {build * 1000:>6.0f} ms {linear_us:>8.1f} µs {scan:>11} {indexed_us:>8.1f} µs "
+              f"{cached_us:>8.1f} µs {linear_ok:>10.0%} {indexed_ok:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+BENCHMARK - CommandClassifier per-call cost
+Compares the original per-call implementation (one re.sub per confusion
+entry, raw pattern strings re-parsed for every template) with the current
+precompiled single-pass classifier, and checks both give the same results.
+The last row repeats the same phrases with the result cache enabled.
+
+Usage:
+    python benchmarks/bench_classifier.py [--calls 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_classifier import CommandClassifier
+
+PHRASES = [
+    "open notepad", "show nodes", "add task study python", "volume up",
+    "what is the time", "take screenshot", "random nonsense", "complete task 2",
+    "remember buy milk", "lock computer", "delete note 1", "help",
+]
+
+
+def legacy_classify(classifier, transcribed_text):
+    """The classifier's scoring as it was before precompilation"""
+    text = transcribed_text.lower().strip()
+    for wrong, correct in classifier.confusion_map.items():
+        text = re.sub(rf'\b{wrong}\b', correct, text)
+    processed_text = text
+    if not processed_text:
+        return None, 0.0
+
+    scores = {}
+    for cmd_name, cmd_config in classifier.command_templates.items():
+        pattern = cmd_config['pattern']
+        match = re.search(pattern, processed_text)
+        if match:
+            pattern_confidence = 1.0
+        else:
+            text_words = set(processed_text.split())
+            pattern_words = set(re.findall(r'\w+', pattern))
+            union = text_words | pattern_words
+            pattern_confidence = len(text_words & pattern_words) / len(union) if union else 0
+        keywords = cmd_config['keywords']
+        keyword_confidence = sum(1 for kw in keywords if kw in processed_text) / len(keywords)
+        combined = pattern_confidence * 0.6 + keyword_confidence * 0.4
+        if match:
+            combined = cmd_config['confidence_boost']
+        scores[cmd_name] = combined
+
+    best = max(scores, key=scores.get)
+    # (the current classifier also builds the result dict and top-3 list,
+    # so the comparison below slightly favours the legacy path)
+    return best, scores[best]
+
+
+def time_calls(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(PHRASES[i % len(PHRASES)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CommandClassifier per-call microbenchmark")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    classifier = CommandClassifier()
+    classifier.cache_size = 0   # measure scoring, not the result cache
+
+    for phrase in PHRASES:
+        result = classifier.classify_command(phrase)
+        legacy = legacy_classify(classifier, phrase)
+        assert (result['top_alternatives'][0][0], result['confidence']) == legacy, phrase
+
+    # Warm the re module cache the legacy path relies on, then measure
+    time_calls(lambda t: legacy_classify(classifier, t), 1000)
+    before = time_calls(lambda t: legacy_classify(classifier, t), args.calls)
+    after = time_calls(classifier.classify_command, args.calls)
+    classifier.cache_size = 256
+    cached = time_calls(classifier.classify_command, args.calls)
+
+    print(f"\n{args.calls} calls over {len(PHRASES)} phrases")
+    print(f"before (per-call regex):  {before:8.2f} µs/call")
+    print(f"after (precompiled):      {after:8.2f} µs/call   ({before / after:.1f}x)")
+    print(f"repeated (LRU cache):     {cached:8.2f} µs/call   ({before / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+BENCHMARK - classify_command cost vs number of templates
+Pads the 20 built-in templates with synthetic commands and compares
+exhaustive scoring with inverted-index candidate pruning at 20, 200 and
+2000 templates. Results of both modes are checked to be identical.
+
+Usage:
+    python benchmarks/bench_classifier_scaling.py [--calls 2000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_classifier import CommandClassifier
+
+SIZES = (20, 200, 2000)
+REAL_PHRASES = [
+    "open notepad", "show nodes", "add task study python", "volume up",
+    "what is the time", "take screenshot", "random nonsense", "complete task 2",
+]
+
+
+def pseudo_words(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))))
+    return sorted(words)
+
+
+def synthetic_templates(base, size, rng):
+    templates = dict(base)
+    pool = pseudo_words(rng, max(64, size))
+    for i in range(size - len(base)):
+        verb, noun, extra = rng.sample(pool, 3)
+        templates[f"synthetic_{i}"] = {
+            "pattern": rf"{verb}\s+{noun}(\s+\w+)?",
+            "confidence_boost": 0.9,
+            "keywords": [verb, noun, extra]
+        }
+    return templates
+
+
+def phrases_for(templates, rng, count):
+    synthetic = [cfg for name, cfg in templates.items() if name.startswith("synthetic_")]
+    phrases = []
+    for i in range(count):
+        if synthetic and i % 2:
+            cfg = rng.choice(synthetic)
+            phrases.append(" ".join(cfg["keywords"][:2]))
+        else:
+            phrases.append(REAL_PHRASES[i % len(REAL_PHRASES)])
+    return phrases
+
+
+def time_calls(classifier, phrases, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        classifier.classify_command(phrases[i % len(phrases)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classifier scaling benchmark")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    classifier = CommandClassifier()
+    classifier.cache_size = 0   # measure scoring, not the result cache
+    base = dict(classifier.command_templates)
+
+    print(f"\n{'templates':>10} {'exhaustive':>14} {'indexed':>14} {'speed-up':>9}")
+    for size in SIZES:
+        classifier.command_templates = synthetic_templates(base, size, rng)
+        classifier.rebuild()
+        phrases = phrases_for(classifier.command_templates, rng, 200)
+
+        for phrase in phrases:
+            classifier.use_candidate_index = False
+            exhaustive = classifier.classify_command(phrase)
+            classifier.use_candidate_index = True
+            assert classifier.classify_command(phrase) == exhaustive, phrase
+
+        classifier.use_candidate_index = False
+        slow = time_calls(classifier, phrases, args.calls)
+        classifier.use_candidate_index = True
+        fast = time_calls(classifier, phrases, args.calls)
+        print(f"{size:>10} {slow:>11.1f} µs {fast:>11.1f} µs {slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+BENCHMARK - classify_batch vs a classify_command loop
+Re-scores a synthetic transcript log (mostly repeated commands plus unique
+noise) one call at a time and with classify_batch in dict, columnar and
+multiprocessing form. Batch results are checked against the single calls.
+
+Usage:
+    python benchmarks/bench_classify_batch.py [--texts 50000] [--processes 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_classifier import CommandClassifier
+
+COMMANDS = [
+    "open notepad", "open chrome", "show tasks", "show nodes", "volume up", "volume down",
+    "what is the time", "take screenshot", "complete task 2", "remember buy milk",
+    "lock computer", "delete note 1", "help", "mute", "add task study python",
+]
+NOISE = "the a um so please can you it that now open show task note volume time".split()
+
+
+def transcript_log(count, unique_share, rng):
+    log = []
+    for _ in range(count):
+        if rng.random() < unique_share:
+            log.append(" ".join(rng.choice(NOISE) for _ in range(rng.randint(1, 6))))
+        else:
+            log.append(rng.choice(COMMANDS))
+    return log
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="classify_batch benchmark")
+    parser.add_argument("--texts", type=int, default=50000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    classifier = CommandClassifier()
+    classifier.cache_size = 0   # measure scoring, not the result cache
+
+    print(f"\n{str(args.texts) + ' texts':<27} {'loop':>9} {'batch':>9} {'columnar':>9} {'processes':>9}")
+    for label, unique_share in (("repeated log (10% noise)", 0.1), ("mostly unique (90% noise)", 0.9)):
+        texts = transcript_log(args.texts, unique_share, rng)
+        single, loop = timed(lambda: [classifier.classify_command(t) for t in texts])
+        batch, batched = timed(lambda: classifier.classify_batch(texts))
+        assert batch == single
+        _, columnar = timed(lambda: classifier.classify_batch(texts, columnar=True))
+        parallel, pooled = timed(lambda: classifier.classify_batch(
+            texts, columnar=True, processes=args.processes, chunk_size=5000))
+        assert parallel['command'] == [r['command'] for r in single]
+        print(f"{label:<27} {loop:>8.2f}s {batched:>8.2f}s {columnar:>8.2f}s {pooled:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
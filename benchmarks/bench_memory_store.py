@@ -0,0 +1,75 @@
+"""
+BENCHMARK - task/note mutation latency: full JSON rewrite vs SQLite
+The agent used to json.dump(indent=2) all of agent_memory.json after every
+add_task/complete_task/add_note. MemoryDB does one WAL transaction per
+add_task, and complete_task finds the Nth pending task via the index.
+Also shows the one-time migration of a JSON file of each size.
+
+Usage:
+    python benchmarks/bench_memory_store.py [--mutations 500] [--sizes 100 10000 1000000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_db import MemoryDB
+
+
+def make_data(count):
+    added = datetime(2025, 1, 1).isoformat()
+    tasks = [{"task": f"task number {i} buy milk", "done": i % 3 == 0, "added": added}
+             for i in range(count // 2)]
+    notes = [{"note": f"note number {i} call the dentist", "time": added} for i in range(count - count // 2)]
+    return {"tasks": tasks, "notes": notes, "apps": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory store benchmark")
+    parser.add_argument("--mutations", type=int, default=500)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"\n{'items':>9} {'rewrite':>11} {'sqlite add':>11} {'sqlite done':>12} {'migration':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "agent_memory.json")
+            data = make_data(size)
+
+            # Old: rewrite the whole file per mutation (fewer rounds at large sizes)
+            rounds = max(3, min(args.mutations, 2_000_000 // size))
+            start = time.perf_counter()
+            for i in range(rounds):
+                data["tasks"].append({"task": f"new {i}", "done": False, "added": datetime.now().isoformat()})
+                with open(path, 'w') as f:
+                    json.dump(data, f, indent=2)
+            rewrite = (time.perf_counter() - start) / rounds
+
+            # One-time import of that file (renames it to *.migrated)
+            db = MemoryDB(os.path.join(folder, "agent_memory.db"))
+            start = time.perf_counter()
+            db.migrate_json(path)
+            migration = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(args.mutations):
+                db.add_task(f"new {i}")
+            sqlite_add = (time.perf_counter() - start) / args.mutations
+            start = time.perf_counter()
+            for i in range(args.mutations):
+                db.complete_task(1 + i % 5)   # "complete task 1".."5", as read out by show_tasks
+            sqlite_done = (time.perf_counter() - start) / args.mutations
+            db.close()
+
+        print(f"{size:>9} {rewrite * 1000:>8.2f} ms {sqlite_add * 1e6:>8.1f} µs {sqlite_done * 1e6:>9.1f} µs "
+              f"{migration:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
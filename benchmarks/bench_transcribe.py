@@ -0,0 +1,99 @@
+"""
+BENCHMARK - Temp WAV round-trip vs in-memory transcription
+Compares the old path (sf.write -> transcribe(path) -> os.remove) with
+passing the captured float32 array straight to faster-whisper.
+
+Usage:
+    python benchmarks/bench_transcribe.py                  # synthetic clip, tiny model
+    python benchmarks/bench_transcribe.py --wav command.wav --model medium
+    python benchmarks/bench_transcribe.py --io-only        # file overhead only, no model
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+import soundfile as sf
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_clip(seconds):
+    """Voice-band tone bursts with a little noise (stand-in for a command)"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0).astype(np.float32)
+    tone = 0.2 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.sin(2 * np.pi * 440 * t)
+    return (tone * envelope + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def load_clip(path):
+    audio, rate = sf.read(path, dtype='float32', always_2d=True)
+    if rate != SAMPLE_RATE:
+        raise SystemExit(f"{path}: expected {SAMPLE_RATE} Hz audio, got {rate} Hz")
+    return audio.mean(axis=1)
+
+
+def timed(fn, runs):
+    fn()  # warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(f"{name:<28} median {statistics.median(samples):8.2f} ms   "
+          f"mean {statistics.mean(samples):8.2f} ms   min {min(samples):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--wav", help="16 kHz clip to transcribe (default: synthetic)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="synthetic clip length")
+    parser.add_argument("--model", default="tiny", help="faster-whisper model size")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--io-only", action="store_true",
+                        help="only time write + decode + unlink, skip the model")
+    args = parser.parse_args()
+
+    audio = load_clip(args.wav) if args.wav else synthetic_clip(args.seconds)
+    print(f"Clip: {len(audio) / SAMPLE_RATE:.2f}s, {args.runs} runs\n")
+
+    from faster_whisper.audio import decode_audio
+
+    def file_io_only():
+        temp = f"temp_bench_{os.getpid()}.wav"
+        sf.write(temp, audio, SAMPLE_RATE)
+        decode_audio(temp, sampling_rate=SAMPLE_RATE)
+        os.remove(temp)
+
+    report("WAV round-trip overhead", timed(file_io_only, args.runs))
+    if args.io_only:
+        return
+
+    from faster_whisper import WhisperModel
+    model = WhisperModel(args.model, device="cpu", compute_type="int8", cpu_threads=4)
+    options = dict(language="en", beam_size=5, best_of=5, temperature=0.0)
+
+    def via_file():
+        temp = f"temp_bench_{os.getpid()}.wav"
+        sf.write(temp, audio, SAMPLE_RATE)
+        segments, _ = model.transcribe(temp, **options)
+        " ".join(s.text for s in segments)
+        os.remove(temp)
+
+    def in_memory():
+        segments, _ = model.transcribe(audio, **options)
+        " ".join(s.text for s in segments)
+
+    report(f"transcribe via WAV ({args.model})", timed(via_file, args.runs))
+    report(f"transcribe in memory ({args.model})", timed(in_memory, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+BENCHMARK - time to first audio: one process per utterance vs a persistent worker
+The old speak() started a fresh PowerShell for every sentence. Without
+PowerShell (Linux CI) both sides use a Python child that speaks the same
+START/DONE line protocol as PowerShellBackend, so the gap shown is process
+start-up alone; on Windows pass --powershell to measure the real synthesizer.
+Each round queues the 6 utterances `show tasks` produces for 5 tasks.
+The barge-in part interrupts that readout half a second in and reports how
+long the worker took to go quiet (the stand-in child honours STOP lines
+like the PowerShell script; it needs a POSIX select() on pipes).
+
+Usage:
+    python benchmarks/bench_tts.py [--rounds 5] [--powershell]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tts import PowerShellBackend, SpeechWorker
+
+UTTERANCES = ["You have 5 tasks"] + [f"{i}. task number {i}" for i in range(1, 6)]
+
+# Stand-in synthesizer: START, a pause per word (cut short by STOP), DONE
+CHILD = (
+    "import os, select, sys, time\n"
+    "word_seconds = float(sys.argv[1])\n"
+    "stdin = os.fdopen(0, 'rb', buffering=0)\n"
+    "while True:\n"
+    "    line = stdin.readline().decode()\n"
+    "    if not line:\n"
+    "        break\n"
+    "    verb, _, text = line.rstrip('\\n').partition('\\t')\n"
+    "    if verb != 'SAY':\n"
+    "        continue\n"
+    "    print('START', flush=True)\n"
+    "    end = time.perf_counter() + word_seconds * len(text.split())\n"
+    "    while time.perf_counter() < end:\n"
+    "        if select.select([stdin], [], [], 0.005)[0] and stdin.readline().strip() == b'STOP':\n"
+    "            break\n"
+    "    print('DONE', flush=True)\n"
+)
+
+
+class ChildProcessBackend(PowerShellBackend):
+    name = "python-child"
+
+    def __init__(self, word_seconds=0.002):
+        super().__init__()
+        self.word_seconds = word_seconds
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", CHILD, str(self.word_seconds)], stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding="utf-8", bufsize=1
+        )
+
+
+def per_utterance(backend_cls, text):
+    """Old behaviour: a new process per utterance; seconds to its START"""
+    backend = backend_cls()
+    start = time.perf_counter()
+    first = []
+    backend.speak(text, lambda: first.append(time.perf_counter()))
+    backend.close()
+    return first[0] - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS worker benchmark")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--powershell", action="store_true", help="use the real PowerShell synthesizer")
+    args = parser.parse_args()
+    backend_cls = PowerShellBackend if args.powershell else ChildProcessBackend
+
+    spawn = [per_utterance(backend_cls, text) for _ in range(args.rounds) for text in UTTERANCES]
+
+    worker = SpeechWorker(backend_cls()).start()
+    worker.say("warm up")
+    worker.wait_idle()
+    worker.start_latency.clear()
+    for _ in range(args.rounds):
+        for text in UTTERANCES:
+            worker.say(text)
+        worker.wait_idle()
+    worker.close()
+    stats = worker.get_stats()
+
+    spawn.sort()
+    print(f"\nbackend: {backend_cls.name}, {len(spawn)} utterances each")
+    print(f"process per utterance: start latency mean {sum(spawn) / len(spawn) * 1000:7.1f} ms "
+          f"p90 {spawn[int(len(spawn) * 0.9)] * 1000:7.1f} ms")
+    latency = stats['backend_start_latency']
+    print(f"persistent worker:     start latency mean {latency['mean'] * 1000:7.1f} ms "
+          f"p90 {latency['p90'] * 1000:7.1f} ms")
+    first_audio = stats['time_to_first_audio']
+    print(f"persistent worker:     time to first audio (incl. queueing) mean "
+          f"{first_audio['mean'] * 1000:.1f} ms, all {stats['spoken'] - 1} in order")
+
+    # Barge-in: interrupt a readout at normal speaking speed
+    backend = PowerShellBackend() if args.powershell else ChildProcessBackend(word_seconds=0.3)
+    worker = SpeechWorker(backend).start()
+    for _ in range(args.rounds):
+        for text in UTTERANCES:
+            worker.say(text)
+        time.sleep(0.5)
+        worker.interrupt()
+        worker.wait_idle()
+    worker.close()
+    stats = worker.get_stats()
+    latency = stats['stop_latency']
+    print(f"barge-in:              quiet {latency['mean'] * 1000:.1f} ms mean "
+          f"(p90 {latency['p90'] * 1000:.1f} ms) after interrupt(), "
+          f"{stats['stale_dropped']} of {len(UTTERANCES) * args.rounds} queued utterances dropped unspoken")
+
+
+if __name__ == "__main__":
+    main()
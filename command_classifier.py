@@ -8,7 +8,147 @@ import json
 import os
 from difflib import SequenceMatcher
 import re
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
+from multiprocessing import Pool
+
+import numpy as np
+
+from intent_model import TfidfIntentModel
+
+try:
+    from re import _parser as sre_parse   # Python 3.11+
+except ImportError:
+    import sre_parse
+
+def _required_literals(parsed):
+    """
+    Literals of which at least one occurs in every match of a parsed regex,
+    or None when no such set can be derived (the template then always has
+    to be scored)
+    """
+    best = None
+    run = []
+
+    def consider(options):
+        nonlocal best
+        if not options or '' in options:
+            return
+        # Prefer the set whose shortest literal is longest (most selective)
+        if best is None or min(map(len, options)) > min(map(len, best)):
+            best = set(options)
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        consider({''.join(run)} if run else None)
+        run = []
+        if op is sre_parse.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                consider(set().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2]))
+    consider({''.join(run)} if run else None)
+    return best
+
+
+def _pattern_words(pattern):
+    """Words of a template pattern (named-group syntax like (?P<app> is not counted)"""
+    return frozenset(re.findall(r'\w+', re.sub(r'\(\?P<\w+>', '(', pattern)))
+
+
+def _trie_regex(literals):
+    """
+    Regex that, at any position, matches the longest of `literals` starting
+    there (shared prefixes are factored out, so cost does not grow with the
+    number of literals the way a flat alternation does)
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return re.compile('(?=(' + build(trie) + '))')
+
+
+class _ObservedDict(dict):
+    """dict that calls on_change after every mutation (nested dicts are observed too)"""
+    
+    def __init__(self, data, on_change):
+        self._on_change = on_change
+        super().__init__((key, self._wrap(value)) for key, value in data.items())
+    
+    def _wrap(self, value):
+        if isinstance(value, dict) and not isinstance(value, _ObservedDict):
+            return _ObservedDict(value, self._on_change)
+        return value
+    
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+    
+    def __reduce__(self):
+        # Pickled copies (classify_batch workers) are plain dicts
+        return dict, (dict(self),)
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._wrap(value))
+        self._changed()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key, self._wrap(value))
+        self._changed()
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+    
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+    
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+# classify_batch worker processes score with their own copy of the classifier
+_worker_classifier = None
+
+
+def _init_batch_worker(classifier):
+    global _worker_classifier
+    _worker_classifier = classifier
+
+
+def _batch_worker_scores(processed_texts):
+    return _worker_classifier._score_matrix(processed_texts)
+
 
 class CommandClassifier:
     """
@@ -16,21 +156,35 @@ class CommandClassifier:
     Uses heuristics: fuzzy matching, keyword detection, confidence scoring
     """
     
+    # Editing these marks the compiled templates (and the result cache) stale
+    _REBUILD_ON = frozenset({"command_templates", "confusion_map", "intent_examples", "tfidf_model_path"})
+    # Changing these only invalidates cached results
+    _CLEAR_CACHE_ON = frozenset({"pattern_match_threshold", "keyword_match_threshold",
+                                 "final_decision_threshold", "tfidf_decision_threshold", "scorer"})
+    
     def __init__(self):
         """Initialize classifier with command templates and confidence thresholds"""
         
+        # LRU cache of ranked results keyed on the preprocessed text
+        self.cache_size = 256                 # entries kept (0 = no caching)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._stale = True
+        
         # Command templates with regex patterns
         self.command_templates = {
             # App commands
             "open": {
-                "pattern": r"open\s+(\w+)",
+                "pattern": r"open\s+(?P<app>\w+)",
                 "confidence_boost": 0.95,
                 "keywords": ["open", "launch", "start"]
             },
             
             # Task commands
             "add_task": {
-                "pattern": r"add\s+task\s+(.*)",
+                "pattern": r"add\s+task\s+(?P<task>.*)",
                 "confidence_boost": 0.90,
                 "keywords": ["add", "task", "create", "new"]
             },
@@ -40,19 +194,19 @@ class CommandClassifier:
                 "keywords": ["show", "tasks", "list", "display"]
             },
             "complete_task": {
-                "pattern": r"(complete|finish|done|mark)\s+task\s+(\d+)",
+                "pattern": r"(complete|finish|done|mark)\s+task\s+(?P<number>\d+)",
                 "confidence_boost": 0.88,
                 "keywords": ["complete", "finish", "done", "task"]
             },
             "delete_task": {
-                "pattern": r"(delete|remove)\s+task\s+(\d+)",
+                "pattern": r"(delete|remove)\s+task\s+(?P<number>\d+)",
                 "confidence_boost": 0.88,
                 "keywords": ["delete", "remove", "task"]
             },
             
             # Note commands
             "remember": {
-                "pattern": r"remember\s+(.*)",
+                "pattern": r"remember\s+(?P<note>.*)",
                 "confidence_boost": 0.91,
                 "keywords": ["remember", "note", "save", "remind"]
             },
@@ -62,7 +216,7 @@ class CommandClassifier:
                 "keywords": ["show", "notes", "list", "display"]
             },
             "delete_note": {
-                "pattern": r"(delete|remove)\s+note\s+(\d+)",
+                "pattern": r"(delete|remove)\s+note\s+(?P<number>\d+)",
                 "confidence_boost": 0.88,
                 "keywords": ["delete", "remove", "note"]
             },
@@ -129,6 +283,35 @@ class CommandClassifier:
         self.pattern_match_threshold = 0.75  # Minimum confidence for pattern matching
         self.keyword_match_threshold = 0.60  # Minimum confidence for keyword matching
         self.final_decision_threshold = 0.70  # Minimum to accept command
+        self.use_candidate_index = True       # Only score templates sharing a token with the input
+        
+        # Scorer: "heuristic" (pattern + keyword weights) or "tfidf" (intent model)
+        self.scorer = "heuristic"
+        self.tfidf_model_path = "intent_model.npz"  # fitted model cache (None = don't save)
+        self.tfidf_decision_threshold = 0.35  # Minimum cosine similarity to accept command
+        
+        # Example utterances per command (TF-IDF training data, with the keywords)
+        self.intent_examples = {
+            "open": ["open notepad", "open chrome", "launch calculator", "start spotify"],
+            "add_task": ["add task study python", "add task buy groceries", "create a new task"],
+            "show_tasks": ["show tasks", "list tasks", "display my tasks", "what are my tasks"],
+            "complete_task": ["complete task 1", "finish task 2", "mark task 3 done"],
+            "delete_task": ["delete task 1", "remove task 2"],
+            "remember": ["remember buy milk", "remember to call mom", "save a note"],
+            "show_notes": ["show notes", "list notes", "display my notes", "read my notes"],
+            "delete_note": ["delete note 1", "remove note 2"],
+            "volume_up": ["volume up", "increase volume", "louder", "turn it up"],
+            "volume_down": ["volume down", "decrease volume", "quieter", "turn it down"],
+            "mute": ["mute", "mute the sound", "silent"],
+            "screenshot": ["take screenshot", "capture screen", "take a screenshot"],
+            "lock": ["lock computer", "lock pc", "lock the machine"],
+            "shutdown": ["shutdown", "shut down the computer", "power off"],
+            "restart": ["restart", "reboot", "restart the computer"],
+            "time": ["time", "what is the time", "what time is it"],
+            "date": ["date", "what is the date", "what day is today"],
+            "help": ["help", "what can you do", "show commands"],
+            "exit": ["exit", "quit", "goodbye", "bye"]
+        }
         
         # Common confusions to filter
         self.confusion_map = {
@@ -142,27 +325,155 @@ class CommandClassifier:
             "chrome": "chrome"
         }
         
+        self.rebuild()
+        
         print("✓ Command Classifier initialized with 20 command templates")
     
+    def __setattr__(self, name, value):
+        if name in self._REBUILD_ON:
+            if isinstance(value, dict):
+                value = _ObservedDict(value, self._mark_stale)
+            super().__setattr__(name, value)
+            self._mark_stale()
+        else:
+            super().__setattr__(name, value)
+            if name in self._CLEAR_CACHE_ON:
+                self.clear_cache()
+    
+    def __getstate__(self):
+        # For classify_batch workers: no lock, no cached results
+        state = dict(self.__dict__)
+        del state['_cache_lock']
+        state['_cache'] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+    
+    def _mark_stale(self):
+        self._stale = True
+    
+    def clear_cache(self):
+        """Drop cached results (hit/miss counters are kept)"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def rebuild(self):
+        """
+        Precompile templates and corrections. Runs automatically before the
+        next classification after command_templates, confusion_map or
+        intent_examples are edited (in-place list edits, e.g. appending a
+        keyword, are not observed: call rebuild() yourself)
+        """
+        self._stale = False
+        self.clear_cache()
+        
+        # (name, compiled pattern, pattern words, keywords, confidence boost)
+        self._compiled_templates = [
+            (cmd_name,
+             re.compile(cmd_config['pattern']),
+             _pattern_words(cmd_config['pattern']),
+             tuple(cmd_config['keywords']),
+             cmd_config['confidence_boost'])
+            for cmd_name, cmd_config in self.command_templates.items()
+        ]
+        
+        # One alternation for every correction; longest first so "nodes"
+        # wins over "node". Identity entries are no-ops and are skipped.
+        corrections = {w: c for w, c in self.confusion_map.items() if w != c}
+        if corrections:
+            alternatives = sorted(corrections, key=len, reverse=True)
+            self._confusion_regex = re.compile(
+                r'\b(?:' + '|'.join(re.escape(w) for w in alternatives) + r')\b'
+            )
+        else:
+            self._confusion_regex = None
+        self._corrections = corrections
+        
+        # Inverted indexes for candidate pruning. A template can only score
+        # above zero if the input shares a word with its pattern (Jaccard),
+        # contains one of its keywords (substring), or contains a literal
+        # every pattern match needs. Templates without such a literal are
+        # always scored.
+        token_index = defaultdict(set)
+        substring_index = defaultdict(set)
+        always = []
+        for index, (cmd_name, pattern, pattern_words, keywords, _) in enumerate(self._compiled_templates):
+            for word in pattern_words:
+                token_index[word].add(index)
+            for keyword in keywords:
+                if keyword:
+                    substring_index[keyword].add(index)
+            required = _required_literals(sre_parse.parse(pattern.pattern))
+            if required is None:
+                always.append(index)
+            else:
+                for literal in required:
+                    substring_index[literal].add(index)
+        # The trie regex reports the longest literal at each position; any
+        # other literal found there is a prefix of it, so fold those in
+        self._substring_index = {
+            literal: frozenset().union(*(substring_index.get(literal[:end], ())
+                                         for end in range(1, len(literal) + 1)))
+            for literal in substring_index
+        }
+        self._token_index = {word: frozenset(hits) for word, hits in token_index.items()}
+        self._substring_regex = _trie_regex(substring_index) if substring_index else None
+        self._always_candidates = frozenset(always)
+        
+        # Dense incidence matrices for classify_batch: the heuristic's
+        # Jaccard and keyword terms for many texts become two matrix products
+        n_templates = len(self._compiled_templates)
+        pattern_vocab = {}
+        keyword_ids = {}
+        for cmd_name, pattern, pattern_words, keywords, _ in self._compiled_templates:
+            for word in pattern_words:
+                pattern_vocab.setdefault(word, len(pattern_vocab))
+            for keyword in keywords:
+                if keyword:
+                    keyword_ids.setdefault(keyword, len(keyword_ids))
+        self._pattern_vocab = pattern_vocab
+        self._pattern_word_matrix = np.zeros((len(pattern_vocab), n_templates))
+        self._keyword_matrix = np.zeros((len(keyword_ids), n_templates))
+        self._empty_keywords = np.zeros(n_templates)
+        for index, (cmd_name, pattern, pattern_words, keywords, _) in enumerate(self._compiled_templates):
+            for word in pattern_words:
+                self._pattern_word_matrix[pattern_vocab[word], index] = 1
+            for keyword in keywords:
+                if keyword:
+                    self._keyword_matrix[keyword_ids[keyword], index] += 1
+                else:
+                    self._empty_keywords[index] += 1
+        self._pattern_word_counts = self._pattern_word_matrix.sum(axis=0)
+        self._keyword_counts = np.array([len(t[3]) for t in self._compiled_templates], dtype=float)
+        self._boosts = np.array([t[4] for t in self._compiled_templates], dtype=float)
+        # Keywords present when the trie reports `literal` (it and its prefixes)
+        self._literal_keywords = {
+            literal: [keyword_ids[literal[:end]] for end in range(1, len(literal) + 1)
+                      if literal[:end] in keyword_ids]
+            for literal in substring_index
+        }
+        
+        # The TF-IDF model is loaded (or trained) on first use
+        self._tfidf_model = None
+    
     def _preprocess_text(self, text):
         """Clean and normalize input text"""
         text = text.lower().strip()
-        # Fix common Whisper mishears
-        for wrong, correct in self.confusion_map.items():
-            text = re.sub(rf'\b{wrong}\b', correct, text)
+        # Fix common Whisper mishears (single pass over the text)
+        if self._confusion_regex is not None:
+            text = self._confusion_regex.sub(lambda m: self._corrections[m.group(0)], text)
         return text
     
-    def _fuzzy_match(self, text, pattern):
+    def _fuzzy_match(self, text, pattern, pattern_words, text_words):
         """Fuzzy string matching for robust pattern detection"""
         # Try exact regex match first
-        match = re.search(pattern, text)
+        match = pattern.search(text)
         if match:
             return 1.0, match
         
         # If no exact match, try fuzzy matching on words
-        text_words = set(text.split())
-        pattern_words = set(re.findall(r'\w+', pattern))
-        
         if not pattern_words:
             return 0.0, None
         
@@ -173,6 +484,186 @@ class CommandClassifier:
         
         return similarity, None
     
+    def _candidates(self, text, text_words):
+        """Indices (in template order) of templates that can score above zero"""
+        found = set(self._always_candidates)
+        for word in text_words:
+            hits = self._token_index.get(word)
+            if hits:
+                found |= hits
+        if self._substring_regex is not None:
+            for match in self._substring_regex.finditer(text):
+                found |= self._substring_index[match.group(1)]
+        return sorted(found)
+    
+    def _rank(self, scores, top_n=3):
+        """
+        Best command and top-N list, identical to ranking every template
+        (unscored templates count as 0 and tie-break in template order)
+        """
+        ranked = sorted([(cmd, conf) for cmd, conf in scores.items() if conf > 0],
+                        key=lambda x: x[1], reverse=True)
+        if len(ranked) < top_n:
+            for cmd_name, *_ in self._compiled_templates:
+                if scores.get(cmd_name, 0.0) <= 0:
+                    ranked.append((cmd_name, scores.get(cmd_name, 0.0)))
+                    if len(ranked) == top_n:
+                        break
+        best_command, best_confidence = ranked[0]
+        return best_command, best_confidence, ranked[:top_n]
+    
+    def _tfidf_training_data(self):
+        """Examples, keyword lists and pattern words for every command"""
+        data = {}
+        for cmd_name, pattern, pattern_words, keywords, _ in self._compiled_templates:
+            words = [w for w in pattern_words if len(w) > 1]
+            data[cmd_name] = list(self.intent_examples.get(cmd_name, [])) + [
+                " ".join(keywords), " ".join(sorted(words))
+            ]
+        return data
+    
+    def _get_tfidf_model(self):
+        if self._tfidf_model is None:
+            model, trained = TfidfIntentModel.load_or_fit(
+                self.tfidf_model_path, self._tfidf_training_data()
+            )
+            if trained:
+                print(f"✓ TF-IDF intent model trained ({len(model.vocabulary)} features)")
+            self._tfidf_model = model
+        return self._tfidf_model
+    
+    def _heuristic_scores(self, processed_text, text_words, matches=None):
+        """
+        Pattern + keyword confidence for every template that can score above 0
+        (regex match objects are stored in `matches` by command name, if given)
+        """
+        if self.use_candidate_index:
+            candidates = self._candidates(processed_text, text_words)
+        else:
+            candidates = range(len(self._compiled_templates))
+        
+        # Score candidate commands (every other template would score 0)
+        scores = {}
+        
+        for index in candidates:
+            cmd_name, pattern, pattern_words, keywords, confidence_boost = self._compiled_templates[index]
+            # Pattern matching confidence
+            pattern_confidence, pattern_match = self._fuzzy_match(
+                processed_text, pattern, pattern_words, text_words
+            )
+            
+            # Keyword confidence
+            keyword_confidence = self._keyword_match_confidence(processed_text, keywords)
+            
+            # Combined confidence (weighted average)
+            # Pattern matching: 60%, Keywords: 40%
+            combined_confidence = (pattern_confidence * 0.6) + (keyword_confidence * 0.4)
+            
+            # Apply confidence boost if strong pattern match
+            if pattern_match:
+                combined_confidence = confidence_boost
+                if matches is not None:
+                    matches[cmd_name] = pattern_match
+            
+            scores[cmd_name] = combined_confidence
+        
+        return scores
+    
+    def _pattern_boosts(self, processed_text, text_words):
+        """(template index, confidence boost, match) for every template whose pattern matches"""
+        for index in self._candidates(processed_text, text_words):
+            _, pattern, _, _, confidence_boost = self._compiled_templates[index]
+            match = pattern.search(processed_text)
+            if match:
+                yield index, confidence_boost, match
+    
+    def _tfidf_scores(self, processed_text, text_words, matches=None):
+        """Cosine similarity to every intent; an exact pattern match still gets its boost"""
+        model = self._get_tfidf_model()
+        similarity = model.score(processed_text)
+        scores = {intent: float(sim) for intent, sim in zip(model.intents, similarity)}
+        for index, confidence_boost, match in self._pattern_boosts(processed_text, text_words):
+            cmd_name = self._compiled_templates[index][0]
+            scores[cmd_name] = max(scores.get(cmd_name, 0.0), confidence_boost)
+            if matches is not None:
+                matches[cmd_name] = match
+        return scores
+    
+    def _score_matrix(self, processed_texts):
+        """Scores of preprocessed, non-empty texts: array (n_texts, n_templates)"""
+        names = [cmd_name for cmd_name, *_ in self._compiled_templates]
+        column = {name: i for i, name in enumerate(names)}
+        scores = np.zeros((len(processed_texts), len(names)))
+        
+        if self.scorer == "tfidf":
+            model = self._get_tfidf_model()
+            similarity = model.score_batch(processed_texts)
+            for j, intent in enumerate(model.intents):
+                if intent in column:
+                    scores[:, column[intent]] = similarity[:, j]
+            for row, text in enumerate(processed_texts):
+                for index, confidence_boost, _ in self._pattern_boosts(text, set(text.split())):
+                    scores[row, index] = max(scores[row, index], confidence_boost)
+        else:
+            scores = self._heuristic_score_matrix(processed_texts)
+        return scores
+    
+    def _heuristic_score_matrix(self, processed_texts):
+        """_heuristic_scores for many texts, with the weighted terms done in NumPy"""
+        n = len(processed_texts)
+        word_cells = ([], [])      # (row, pattern word) coordinates
+        keyword_cells = ([], [])   # (row, keyword) coordinates
+        text_sizes = np.zeros(n)
+        matched = []   # (row, template index) pairs whose regex matches
+        templates = self._compiled_templates
+        
+        # Per text: tokens, substring literals and regexes of the candidates only
+        for row, text in enumerate(processed_texts):
+            text_words = set(text.split())
+            text_sizes[row] = len(text_words)
+            candidates = set(self._always_candidates)
+            for word in text_words:
+                column = self._pattern_vocab.get(word)
+                if column is not None:
+                    word_cells[0].append(row)
+                    word_cells[1].append(column)
+                    candidates |= self._token_index[word]
+            if self._substring_regex is not None:
+                for match in self._substring_regex.finditer(text):
+                    literal = match.group(1)
+                    for column in self._literal_keywords[literal]:
+                        keyword_cells[0].append(row)
+                        keyword_cells[1].append(column)
+                    candidates |= self._substring_index[literal]
+            matched.extend((row, index) for index in candidates if templates[index][1].search(text))
+        
+        word_hits = np.zeros((n, len(self._pattern_vocab)))
+        word_hits[word_cells] = 1
+        keyword_hits = np.zeros((n, len(self._keyword_matrix)))
+        keyword_hits[keyword_cells] = 1
+        
+        # Jaccard(text words, pattern words) and keyword fraction per template
+        intersection = word_hits @ self._pattern_word_matrix
+        union = text_sizes[:, None] + self._pattern_word_counts - intersection
+        pattern_confidence = np.divide(intersection, union, out=np.zeros_like(intersection),
+                                       where=(union > 0) & (self._pattern_word_counts > 0))
+        found_keywords = keyword_hits @ self._keyword_matrix + self._empty_keywords
+        keyword_confidence = np.divide(found_keywords, self._keyword_counts,
+                                       out=np.zeros_like(found_keywords),
+                                       where=self._keyword_counts > 0)
+        
+        # Pattern matching: 60%, Keywords: 40%; a regex match takes the boost
+        scores = (pattern_confidence * 0.6) + (keyword_confidence * 0.4)
+        if matched:
+            rows, columns = np.array(matched).T
+            scores[rows, columns] = self._boosts[columns]
+        return scores
+    
+    def _decision_threshold(self):
+        if self.scorer == "tfidf":
+            return self.tfidf_decision_threshold
+        return self.final_decision_threshold
+    
     def _keyword_match_confidence(self, text, keywords):
         """Calculate confidence based on keyword presence"""
         found_keywords = sum(1 for kw in keywords if kw in text)
@@ -189,10 +680,15 @@ class CommandClassifier:
             'confidence': 0.0-1.0,
             'original_text': 'what user said',
             'is_valid': True/False,
-            'reasoning': 'why this classification'
+            'reasoning': 'why this classification',
+            'slots': {'app' | 'task' | 'number' | 'note': value}
+                     (named groups of the matched template pattern)
         }
         """
         
+        if self._stale:
+            self.rebuild()
+        
         # Preprocess
         processed_text = self._preprocess_text(transcribed_text)
         
@@ -202,41 +698,53 @@ class CommandClassifier:
                 'confidence': 0.0,
                 'original_text': transcribed_text,
                 'is_valid': False,
-                'reasoning': 'Empty input'
+                'reasoning': 'Empty input',
+                'slots': {}
             }
         
-        # Score all commands
-        scores = {}
-        matches = {}
+        # Users repeat the same few commands: reuse the ranking if seen recently
+        with self._cache_lock:
+            ranked = self._cache.get(processed_text)
+            if ranked is not None:
+                self._cache.move_to_end(processed_text)
+                self.cache_hits += 1
         
-        for cmd_name, cmd_config in self.command_templates.items():
-            pattern = cmd_config['pattern']
-            keywords = cmd_config['keywords']
-            confidence_boost = cmd_config['confidence_boost']
-            
-            # Pattern matching confidence
-            pattern_confidence, pattern_match = self._fuzzy_match(processed_text, pattern)
+        if ranked is None:
+            text_words = set(processed_text.split())
+            matches = {}
+            if self.scorer == "tfidf":
+                scores = self._tfidf_scores(processed_text, text_words, matches)
+            else:
+                scores = self._heuristic_scores(processed_text, text_words, matches)
             
-            # Keyword confidence
-            keyword_confidence = self._keyword_match_confidence(processed_text, keywords)
-            
-            # Combined confidence (weighted average)
-            # Pattern matching: 60%, Keywords: 40%
-            combined_confidence = (pattern_confidence * 0.6) + (keyword_confidence * 0.4)
+            # Find best match
+            best_command, best_confidence, top_alternatives = self._rank(scores)
+            ranked = (best_command, best_confidence, tuple(top_alternatives),
+                      self._slots(matches.get(best_command)))
             
-            # Apply confidence boost if strong pattern match
-            if pattern_match:
-                combined_confidence = confidence_boost
-            
-            scores[cmd_name] = combined_confidence
-            matches[cmd_name] = pattern_match
-        
-        # Find best match
-        best_command = max(scores, key=scores.get)
-        best_confidence = scores[best_command]
+            with self._cache_lock:
+                self.cache_misses += 1
+                if self.cache_size > 0:
+                    self._cache[processed_text] = ranked
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
         
+        best_command, best_confidence, top_alternatives, slots = ranked
+        return self._build_result(transcribed_text, processed_text, best_command,
+                                  best_confidence, list(top_alternatives), dict(slots))
+    
+    @staticmethod
+    def _slots(match):
+        """Named groups that took part in the match"""
+        if match is None:
+            return {}
+        return {name: value.strip() for name, value in match.groupdict().items() if value is not None}
+    
+    def _build_result(self, transcribed_text, processed_text, best_command,
+                      best_confidence, top_alternatives, slots):
+        """classify_command result dict for a ranked, non-empty input"""
         # Determine if valid
-        is_valid = best_confidence >= self.final_decision_threshold
+        is_valid = best_confidence >= self._decision_threshold()
         
         # Generate reasoning
         if is_valid:
@@ -253,20 +761,109 @@ class CommandClassifier:
             'processed_text': processed_text,
             'is_valid': is_valid,
             'reasoning': reasoning,
-            'top_alternatives': sorted([(cmd, conf) for cmd, conf in scores.items()], 
-                                      key=lambda x: x[1], reverse=True)[:3]
+            'top_alternatives': top_alternatives,
+            'slots': slots
         }
         
         return result
     
+    def classify_batch(self, texts, columnar=False, processes=None, chunk_size=2000):
+        """
+        Classify many transcripts at once (offline re-scoring, threshold tuning)
+        
+        Inputs are normalized once per distinct text and scored into one
+        (n_texts, n_templates) array that is ranked with NumPy. With
+        processes > 1, scoring is split into chunk_size pieces across a
+        multiprocessing pool (worth it for tens of thousands of texts).
+        
+        Returns a list of classify_command dicts, or with columnar=True:
+        {
+            'commands': template names (column order of top_indices),
+            'original_text': [...], 'processed_text': [...],
+            'command': [name or None, ...],
+            'confidence': float array, 'is_valid': bool array,
+            'top_indices': int array (n, 3), -1 for empty input,
+            'top_scores': float array (n, 3)
+        }
+        """
+        if self._stale:
+            self.rebuild()
+        
+        texts = list(texts)
+        processed = [self._preprocess_text(text) for text in texts]
+        
+        # Score each distinct normalized text once
+        unique = list(dict.fromkeys(p for p in processed if p))
+        if processes and processes > 1 and len(unique) > chunk_size:
+            chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+            with Pool(processes, initializer=_init_batch_worker, initargs=(self,)) as pool:
+                unique_scores = np.vstack(pool.map(_batch_worker_scores, chunks))
+        else:
+            unique_scores = self._score_matrix(unique)
+        
+        names = [cmd_name for cmd_name, *_ in self._compiled_templates]
+        top_n = min(3, len(names))
+        # Stable sort: ties keep template order, as in _rank
+        order = np.argsort(-unique_scores, axis=1, kind="stable")[:, :top_n]
+        ranked_scores = np.take_along_axis(unique_scores, order, axis=1)
+        
+        n = len(texts)
+        row_of = {text: i for i, text in enumerate(unique)}
+        rows = np.array([row_of.get(p, -1) for p in processed], dtype=np.int64)
+        non_empty = rows >= 0
+        top_indices = np.full((n, top_n), -1, dtype=np.int64)
+        top_scores = np.zeros((n, top_n))
+        top_indices[non_empty] = order[rows[non_empty]]
+        top_scores[non_empty] = ranked_scores[rows[non_empty]]
+        confidence = top_scores[:, 0] if top_n else np.zeros(n)
+        is_valid = non_empty & (confidence >= self._decision_threshold())
+        
+        if columnar:
+            return {
+                'commands': names,
+                'original_text': texts,
+                'processed_text': processed,
+                'command': [names[top_indices[i, 0]] if is_valid[i] else None for i in range(n)],
+                'confidence': confidence,
+                'is_valid': is_valid,
+                'top_indices': top_indices,
+                'top_scores': top_scores
+            }
+        
+        results = []
+        for i, (text, processed_text) in enumerate(zip(texts, processed)):
+            if not non_empty[i]:
+                results.append({
+                    'command': None,
+                    'confidence': 0.0,
+                    'original_text': text,
+                    'is_valid': False,
+                    'reasoning': 'Empty input',
+                    'slots': {}
+                })
+                continue
+            top_alternatives = [(names[j], float(c)) for j, c in zip(top_indices[i], top_scores[i])]
+            best_command, best_confidence = top_alternatives[0]
+            # Slots come from the best template only, so only its regex is re-run
+            match = self._compiled_templates[top_indices[i, 0]][1].search(processed_text)
+            results.append(self._build_result(text, processed_text, best_command,
+                                              best_confidence, top_alternatives, self._slots(match)))
+        return results
+    
     def get_classification_stats(self):
-        """Return classifier configuration stats"""
+        """Return classifier configuration and result-cache stats"""
+        lookups = self.cache_hits + self.cache_misses
         return {
             'commands_trained': len(self.command_templates),
             'pattern_match_threshold': self.pattern_match_threshold,
             'keyword_match_threshold': self.keyword_match_threshold,
             'final_decision_threshold': self.final_decision_threshold,
-            'confusion_corrections': len(self.confusion_map)
+            'confusion_corrections': len(self.confusion_map),
+            'cache_size': self.cache_size,
+            'cache_entries': len(self._cache),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_rate': self.cache_hits / lookups if lookups else 0.0
         }
 
 
@@ -281,6 +878,7 @@ if __name__ == "__main__":
         "remember buy milk",
         "show nodes",  # Mishear of "notes" -> should correct
         "add task study python",
+        "finish task 2",  # Synonym -> slot 'number' from the same match
         "volume up",
         "what is the time",
         "take screenshot",
@@ -301,6 +899,8 @@ if __name__ == "__main__":
         print(f"   → Command: {result['command']}")
         print(f"   → Confidence: {result['confidence']:.2f}")
         print(f"   → Reason: {result['reasoning']}")
+        if result['slots']:
+            print(f"   → Slots: {result['slots']}")
         if result['top_alternatives']:
             print(f"   → Top 3: {[(cmd, f'{conf:.2f}') for cmd, conf in result['top_alternatives']]}")
     
@@ -0,0 +1,107 @@
+"""
+HOTKEY - Push-to-talk event sources
+Backends push press/release events onto a queue from their own thread, so
+the agent's main loop blocks on wait() instead of polling the key state.
+"""
+
+import queue
+import threading
+
+PRESS = "press"
+RELEASE = "release"
+CLOSED = "closed"
+
+
+class HotkeySource:
+    """
+    Base class for push-to-talk backends
+
+    Subclasses call _emit(PRESS / RELEASE) when the key changes state and
+    _close() when no more events will come. Repeated presses from key
+    auto-repeat are collapsed, so the loop only ever sees edges.
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.is_pressed = False
+
+    def _emit(self, event):
+        if (event == PRESS) == self.is_pressed:
+            return
+        self.is_pressed = event == PRESS
+        self.events.put(event)
+
+    def _close(self):
+        self.events.put(CLOSED)
+
+    def wait(self, timeout=None):
+        """Block until the next event; returns None on timeout"""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class KeyboardHotkey(HotkeySource):
+    """Global hotkey via the `keyboard` library's press/release hooks"""
+
+    def __init__(self, key):
+        super().__init__()
+        self.key = key
+        self._hooks = []
+
+    def start(self):
+        import keyboard
+        self._hooks = [
+            keyboard.on_press_key(self.key, lambda e: self._emit(PRESS)),
+            keyboard.on_release_key(self.key, lambda e: self._emit(RELEASE)),
+        ]
+
+    def stop(self):
+        if self._hooks:
+            import keyboard
+            for hook in self._hooks:
+                keyboard.unhook(hook)
+            self._hooks = []
+        self._close()
+
+
+class ScriptedHotkey(HotkeySource):
+    """
+    Replays a fixed press/release script, then closes
+
+    script: sequence of (delay_seconds, event) pairs, e.g.
+        [(0.5, PRESS), (1.2, RELEASE)]   # hold for 1.2 s after 0.5 s
+    Stands in for the keyboard where no global key hooks are available;
+    tests/test_agent_loop.py drives VoiceAgent.run() with it.
+    """
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._play, daemon=True)
+        self._thread.start()
+
+    def _play(self):
+        for delay, event in self.script:
+            if self._stopped.wait(delay):
+                break
+            self._emit(event)
+        self._close()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
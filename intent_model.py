@@ -0,0 +1,174 @@
+"""
+INTENT MODEL - TF-IDF intent scorer for CommandClassifier
+Character n-gram + word n-gram TF-IDF vectors, one L2-normalized centroid
+row per intent in a NumPy matrix. Scoring an utterance against every
+intent is one sparse-query x matrix product; a batch is one matrix product.
+The fitted model is saved to .npz so start-up loads instead of retraining.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+
+class TfidfIntentModel:
+    """
+    TF-IDF (char + word n-grams) nearest-centroid intent model
+
+    fit({intent: [example, ...]}) learns the vocabulary and IDF weights and
+    builds `matrix` (n_intents x n_features, float32, rows L2-normalized).
+    score(text) returns cosine similarity to each intent, in `intents` order.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, char_ngrams=(3, 5), word_ngrams=(1, 2), sublinear_tf=True):
+        self.char_ngrams = tuple(char_ngrams)
+        self.word_ngrams = tuple(word_ngrams)
+        self.sublinear_tf = sublinear_tf
+        self.intents = []
+        self.vocabulary = {}
+        self.idf = None
+        self.matrix = None
+        self.fingerprint = None
+
+    # ------------------------------------------------------------------
+    # Features
+    def _features(self, text):
+        words = re.findall(r"\w+", text.lower())
+        features = Counter()
+        low, high = self.word_ngrams
+        for n in range(low, high + 1):
+            for i in range(len(words) - n + 1):
+                features["w:" + " ".join(words[i:i + n])] += 1
+        low, high = self.char_ngrams
+        for word in words:
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    features["c:" + padded[i:i + n]] += 1
+        return features
+
+    def _weights(self, counts):
+        tf = np.fromiter(counts, dtype=np.float32, count=len(counts))
+        return 1.0 + np.log(tf) if self.sublinear_tf else tf
+
+    def transform(self, text):
+        """Sparse TF-IDF query vector as (feature indices, L2-normalized values)"""
+        features = self._features(text)
+        hits = [(self.vocabulary[f], c) for f, c in features.items() if f in self.vocabulary]
+        if not hits:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        indices = np.fromiter((i for i, _ in hits), dtype=np.int64, count=len(hits))
+        values = self._weights([c for _, c in hits]) * self.idf[indices]
+        norm = np.linalg.norm(values)
+        return indices, values / norm if norm else values
+
+    # ------------------------------------------------------------------
+    # Training
+    @staticmethod
+    def make_fingerprint(training_data, params):
+        payload = json.dumps([TfidfIntentModel.FORMAT_VERSION, params, training_data], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _params(self):
+        return [list(self.char_ngrams), list(self.word_ngrams), self.sublinear_tf]
+
+    def fit(self, training_data):
+        """training_data: {intent: [example utterance, ...]}"""
+        self.intents = list(training_data)
+        documents = [(intent, self._features(text))
+                     for intent in self.intents for text in training_data[intent]]
+
+        document_frequency = Counter()
+        for _, features in documents:
+            document_frequency.update(features.keys())
+        self.vocabulary = {f: i for i, f in enumerate(sorted(document_frequency))}
+        df = np.array([document_frequency[f] for f in sorted(document_frequency)], dtype=np.float32)
+        self.idf = (np.log((1.0 + len(documents)) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        # Centroid of the (normalized) example vectors of each intent
+        self.matrix = np.zeros((len(self.intents), len(self.vocabulary)), dtype=np.float32)
+        row_of = {intent: i for i, intent in enumerate(self.intents)}
+        for intent, features in documents:
+            indices = np.array([self.vocabulary[f] for f in features], dtype=np.int64)
+            values = self._weights(list(features.values())) * self.idf[indices]
+            self.matrix[row_of[intent], indices] += values / np.linalg.norm(values)
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        self.matrix /= np.where(norms == 0, 1.0, norms)
+
+        self.fingerprint = self.make_fingerprint(training_data, self._params())
+        return self
+
+    # ------------------------------------------------------------------
+    # Scoring
+    def score(self, text):
+        """Cosine similarity of `text` to every intent (one matrix-vector product)"""
+        indices, values = self.transform(text)
+        if len(indices) == 0:
+            return np.zeros(len(self.intents), dtype=np.float32)
+        return self.matrix[:, indices] @ values
+
+    def score_batch(self, texts, chunk_size=4096):
+        """Cosine similarity of each text to every intent, shape (len(texts), n_intents)"""
+        out = np.zeros((len(texts), len(self.intents)), dtype=np.float32)
+        # Dense query rows are built a chunk at a time to bound memory
+        for start in range(0, len(texts), chunk_size):
+            chunk = texts[start:start + chunk_size]
+            query = np.zeros((len(chunk), len(self.vocabulary)), dtype=np.float32)
+            for row, text in enumerate(chunk):
+                indices, values = self.transform(text)
+                query[row, indices] = values
+            out[start:start + len(chunk)] = query @ self.matrix.T
+        return out
+
+    # ------------------------------------------------------------------
+    # Persistence
+    def save(self, path):
+        features = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp,
+            matrix=self.matrix, idf=self.idf,
+            features=np.array(features, dtype=np.str_),
+            intents=np.array(self.intents, dtype=np.str_),
+            meta=np.array(json.dumps({"fingerprint": self.fingerprint, "params": self._params()}))
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            char_ngrams, word_ngrams, sublinear_tf = meta["params"]
+            model = cls(char_ngrams, word_ngrams, sublinear_tf)
+            model.matrix = data["matrix"]
+            model.idf = data["idf"]
+            model.vocabulary = {f: i for i, f in enumerate(data["features"].tolist())}
+            model.intents = data["intents"].tolist()
+            model.fingerprint = meta["fingerprint"]
+        return model
+
+    @classmethod
+    def load_or_fit(cls, path, training_data, **params):
+        """Load the saved model if it was trained on the same data, else fit and save"""
+        model = cls(**params)
+        fingerprint = cls.make_fingerprint(training_data, model._params())
+        if path and os.path.exists(path):
+            try:
+                saved = cls.load(path)
+                if saved.fingerprint == fingerprint:
+                    return saved, False
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Intent model at {path} unreadable ({e}), retraining")
+        model.fit(training_data)
+        if path:
+            try:
+                model.save(path)
+            except OSError as e:
+                print(f"⚠️ Could not save intent model: {e}")
+        return model, True
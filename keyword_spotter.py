@@ -0,0 +1,267 @@
+"""
+KEYWORD SPOTTER - MFCC + DTW template matching for fixed commands
+Fixed phrases like "volume up" or "show tasks" do not need a Whisper
+decode: a few enrolled recordings per phrase are turned into MFCC
+sequences, and a new utterance is aligned against all of them at once with
+dynamic time warping (a few milliseconds on CPU). Only a clear, confident
+match is accepted; anything else (free-form "add task ...") falls back to
+speech_to_text.
+
+Enroll from the microphone:
+    python keyword_spotter.py --enroll "volume up" --takes 3
+Recordings are kept as keyword_templates/<phrase>/<n>.wav.
+"""
+
+import argparse
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate, n_fft, n_mels):
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.floor((n_fft + 1) * edges / sample_rate).astype(int)
+    bank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n_mels, n_mfcc):
+    """Orthonormal DCT-II rows 0..n_mfcc-1"""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    dct[0] /= np.sqrt(2.0)
+    return dct.astype(np.float32)
+
+
+def mfcc(audio, sample_rate=16000, n_mfcc=13, n_mels=26, frame_ms=30, hop_ms=20, n_fft=512):
+    """MFCC frames (n_frames, n_mfcc) of a float32 mono signal"""
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    frame = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if len(audio) < frame:
+        audio = np.pad(audio, (0, frame - len(audio)))
+    emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, frame)[::hop] * np.hamming(frame)
+    power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+    log_mel = np.log(power @ _mel_filterbank(sample_rate, n_fft, n_mels).T + 1e-10)
+    return (log_mel @ _dct_matrix(n_mels, n_mfcc).T).astype(np.float32)
+
+
+class KeywordSpotter:
+    """
+    Nearest-template keyword spotting with DTW
+
+    enroll(label, audio) adds a template (labels are the phrases fed to the
+    agent in place of a transcript, e.g. "volume up"). spot(audio) returns
+    (label or None, info). A label is returned only if its best template's
+    length-normalized DTW cost is below `threshold` and clearly lower than
+    the best other phrase (best / runner-up <= max_ratio). The defaults
+    keep false accepts of unknown phrases near zero on
+    bench_keyword_spotter; a miss only costs a Whisper decode.
+
+    Labels in `whisper_only` (e.g. "shutdown") stay enrolled so they
+    compete with the other phrases, but are never returned: a wrong spot
+    must not be able to run a destructive command without Whisper and the
+    classifier seeing it.
+    """
+
+    def __init__(self, sample_rate=16000, threshold=None, max_ratio=0.6,
+                 default_threshold=4.0, threshold_scale=1.0, whisper_only=()):
+        self.sample_rate = sample_rate
+        self.threshold = threshold              # None = calibrate() from the enrollments
+        self.max_ratio = max_ratio
+        self.default_threshold = default_threshold
+        self.threshold_scale = threshold_scale
+        self.whisper_only = set(whisper_only)
+        self.templates = {}                     # label -> [feature arrays]
+        self._packed = None
+
+        self.spotted = 0
+        self.fallbacks = 0
+        self.spot_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Enrollment
+    def features(self, audio):
+        """MFCCs with per-utterance mean/variance normalization (mic/gain invariant)"""
+        feats = mfcc(audio, self.sample_rate)
+        return (feats - feats.mean(axis=0)) / (feats.std(axis=0) + 1e-5)
+
+    def enroll(self, label, audio):
+        self.templates.setdefault(label, []).append(self.features(audio))
+        self._packed = None
+
+    def enroll_directory(self, root):
+        """Enroll every <root>/<phrase>/*.wav; returns the number of templates"""
+        import soundfile as sf
+        count = 0
+        if not os.path.isdir(root):
+            return 0
+        for folder in sorted(os.listdir(root)):
+            path = os.path.join(root, folder)
+            if not os.path.isdir(path):
+                continue
+            label = folder.replace("_", " ")
+            for name in sorted(os.listdir(path)):
+                if not name.lower().endswith(".wav"):
+                    continue
+                audio, rate = sf.read(os.path.join(path, name), dtype="float32")
+                if audio.ndim > 1:
+                    audio = audio.mean(axis=1)
+                if rate != self.sample_rate:
+                    print(f"⚠️ Skipping {name}: {rate} Hz (expected {self.sample_rate})")
+                    continue
+                self.enroll(label, audio)
+                count += 1
+        return count
+
+    def _pack(self):
+        """All templates as one zero-padded (n_templates, max_frames, n_mfcc) array"""
+        if self._packed is None:
+            labels, feats = [], []
+            for label, items in self.templates.items():
+                for item in items:
+                    labels.append(label)
+                    feats.append(item)
+            longest = max(len(f) for f in feats)
+            stack = np.zeros((len(feats), longest, feats[0].shape[1]), dtype=np.float32)
+            for i, f in enumerate(feats):
+                stack[i, :len(f)] = f
+            lengths = np.array([len(f) for f in feats])
+            self._packed = (labels, stack, lengths, (stack ** 2).sum(axis=2))
+        return self._packed
+
+    # ------------------------------------------------------------------
+    # Matching
+    def distances(self, feats):
+        """
+        Length-normalized DTW cost of `feats` against every template
+
+        Step pattern: each input frame advances the template by 0, 1 or 2
+        frames, so every row of the DP only depends on the previous row and
+        all templates are aligned together with whole-array operations.
+        """
+        labels, stack, lengths, stack_sq = self._pack()
+        n_templates, width, _ = stack.shape
+        # Frame-to-frame Euclidean distances, (n_frames, n_templates, width)
+        cross = np.einsum("fd,twd->ftw", feats, stack)
+        cost = np.sqrt(np.maximum((feats ** 2).sum(axis=1)[:, None, None] + stack_sq - 2 * cross, 0.0))
+
+        acc = np.full((n_templates, width), np.inf, dtype=np.float32)
+        acc[:, 0] = cost[0, :, 0]
+        best = np.empty_like(acc)
+        for i in range(1, len(feats)):
+            np.copyto(best, acc)
+            np.minimum(best[:, 1:], acc[:, :-1], out=best[:, 1:])
+            np.minimum(best[:, 2:], acc[:, :-2], out=best[:, 2:])
+            np.add(best, cost[i], out=acc)
+        return acc[np.arange(n_templates), lengths - 1] / len(feats)
+
+    def calibrate(self):
+        """
+        Threshold from the enrollments: threshold_scale x the largest
+        leave-one-out distance between takes of the same phrase
+        """
+        worst = 0.0
+        for label, items in self.templates.items():
+            for i, item in enumerate(items):
+                others = items[:i] + items[i + 1:]
+                if not others:
+                    continue
+                held_out = KeywordSpotter(self.sample_rate)
+                held_out.templates = {label: others}
+                worst = max(worst, float(held_out.distances(item).min()))
+        self.threshold = worst * self.threshold_scale if worst else self.default_threshold
+        return self.threshold
+
+    def spot(self, audio):
+        """
+        Returns (label or None, info) with info =
+        {'label': nearest phrase, 'distance', 'runner_up', 'seconds'}
+        """
+        if not self.templates:
+            return None, {'label': None, 'distance': None, 'runner_up': None, 'seconds': 0.0}
+        if self.threshold is None:
+            self.calibrate()
+        start = time.perf_counter()
+        feats = self.features(audio)
+        distances = self.distances(feats)
+        labels = self._pack()[0]
+
+        per_label = {}
+        for label, distance in zip(labels, distances):
+            per_label[label] = min(per_label.get(label, np.inf), float(distance))
+        ranked = sorted(per_label.items(), key=lambda item: item[1])
+        label, distance = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else np.inf
+        seconds = time.perf_counter() - start
+        self.spot_seconds += seconds
+
+        accepted = (distance <= self.threshold and distance <= self.max_ratio * runner_up
+                    and label not in self.whisper_only)
+        info = {'label': label, 'distance': distance, 'runner_up': runner_up, 'seconds': seconds}
+        if accepted:
+            self.spotted += 1
+            return label, info
+        self.fallbacks += 1
+        return None, info
+
+    def get_stats(self):
+        calls = self.spotted + self.fallbacks
+        return {
+            'phrases': len(self.templates),
+            'templates': sum(len(items) for items in self.templates.values()),
+            'threshold': self.threshold,
+            'spotted': self.spotted,
+            'fallbacks': self.fallbacks,
+            'mean_ms': self.spot_seconds / calls * 1000 if calls else None
+        }
+
+
+# Record enrollment takes from the microphone
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record keyword-spotter templates")
+    parser.add_argument("--enroll", required=True, help='phrase, e.g. "volume up"')
+    parser.add_argument("--takes", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--dir", default="keyword_templates")
+    args = parser.parse_args()
+
+    import sounddevice as sd
+    import soundfile as sf
+    from vad import EnergyVAD
+
+    sample_rate = 16000
+    vad = EnergyVAD(sample_rate)
+    folder = os.path.join(args.dir, args.enroll.strip().lower().replace(" ", "_"))
+    os.makedirs(folder, exist_ok=True)
+    existing = len([n for n in os.listdir(folder) if n.endswith(".wav")])
+
+    for take in range(1, args.takes + 1):
+        input(f"\nTake {take}/{args.takes}: press Enter, then say '{args.enroll}'")
+        audio = sd.rec(int(args.seconds * sample_rate), samplerate=sample_rate, channels=1, dtype="float32")
+        sd.wait()
+        trimmed, report = vad.process(audio[:, 0])
+        if trimmed is None:
+            print("  No speech detected, take skipped")
+            continue
+        path = os.path.join(folder, f"{existing + take}.wav")
+        sf.write(path, trimmed, sample_rate)
+        print(f"  Saved {path} ({report['kept_seconds']:.2f}s of speech)")
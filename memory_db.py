@@ -0,0 +1,228 @@
+"""
+MEMORY DB - SQLite store for tasks, notes and apps
+The agent and backend/server.js both used to read and rewrite the whole of
+agent_memory.json (last writer wins, O(N) per request). Both now open
+agent_memory.db in WAL mode: readers never block the writer, each
+mutation is one small transaction, and "task 3" is an indexed OFFSET
+query on pending tasks instead of a scan of the full list.
+
+One-time migration (also run automatically by the agents and by
+backend/server.js):
+    python memory_db.py [--json agent_memory.json] [--db agent_memory.db]
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import memory_store
+
+# Keep in sync with SCHEMA in backend/server.js
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    added TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (done, id);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    note TEXT NOT NULL,
+    time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apps (
+    name TEXT PRIMARY KEY,
+    command TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+class MemoryDB:
+    """
+    Data-access layer over agent_memory.db
+
+    Tasks and notes are addressed the way the user speaks them: pending task
+    n / note n, 1-based, oldest first. Rows come back as dicts with the
+    JSON-era keys (task/done/added, note/time) plus their id. Safe to share
+    between the agent's threads.
+    """
+
+    def __init__(self, path="agent_memory.db", timeout=5.0):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")   # durable at checkpoints; WAL keeps it consistent
+        self.conn.executescript(SCHEMA)
+        self._data_version = self._version()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _task(row):
+        return {"id": row["id"], "task": row["task"], "done": bool(row["done"]), "added": row["added"]}
+
+    @staticmethod
+    def _note(row):
+        return {"id": row["id"], "note": row["note"], "time": row["time"]}
+
+    # ------------------------------------------------------------------
+    # Tasks
+    def add_task(self, text, added=None):
+        added = added or datetime.now().isoformat()
+        with self._transaction() as conn:
+            cursor = conn.execute("INSERT INTO tasks (task, done, added) VALUES (?, 0, ?)", (text, added))
+        return {"id": cursor.lastrowid, "task": text, "done": False, "added": added}
+
+    def count_pending_tasks(self):
+        return self._query("SELECT COUNT(*) FROM tasks WHERE done = 0")[0][0]
+
+    def pending_tasks(self, limit=None):
+        rows = self._query("SELECT * FROM tasks WHERE done = 0 ORDER BY id LIMIT ?",
+                           (-1 if limit is None else limit,))
+        return [self._task(row) for row in rows]
+
+    def _pending_task(self, conn, number):
+        if number < 1:
+            return None
+        return conn.execute("SELECT * FROM tasks WHERE done = 0 ORDER BY id LIMIT 1 OFFSET ?",
+                            (number - 1,)).fetchone()
+
+    def complete_task(self, number):
+        """Mark pending task `number` done; returns it, or None if there is no such task"""
+        with self._transaction() as conn:
+            row = self._pending_task(conn, number)
+            if row is not None:
+                conn.execute("UPDATE tasks SET done = 1 WHERE id = ?", (row["id"],))
+        return None if row is None else {**self._task(row), "done": True}
+
+    def delete_task(self, number):
+        """Delete pending task `number`; returns it, or None if there is no such task"""
+        with self._transaction() as conn:
+            row = self._pending_task(conn, number)
+            if row is not None:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (row["id"],))
+        return None if row is None else self._task(row)
+
+    # ------------------------------------------------------------------
+    # Notes
+    def add_note(self, text, time=None):
+        time = time or datetime.now().isoformat()
+        with self._transaction() as conn:
+            cursor = conn.execute("INSERT INTO notes (note, time) VALUES (?, ?)", (text, time))
+        return {"id": cursor.lastrowid, "note": text, "time": time}
+
+    def count_notes(self):
+        return self._query("SELECT COUNT(*) FROM notes")[0][0]
+
+    def recent_notes(self, limit=5):
+        """The newest `limit` notes, oldest first"""
+        rows = self._query("SELECT * FROM (SELECT * FROM notes ORDER BY id DESC LIMIT ?) ORDER BY id", (limit,))
+        return [self._note(row) for row in rows]
+
+    def delete_note(self, number):
+        """Delete note `number` (1 = oldest); returns it, or None if there is no such note"""
+        with self._transaction() as conn:
+            row = None
+            if number >= 1:
+                row = conn.execute("SELECT * FROM notes ORDER BY id LIMIT 1 OFFSET ?", (number - 1,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM notes WHERE id = ?", (row["id"],))
+        return None if row is None else self._note(row)
+
+    # ------------------------------------------------------------------
+    # Apps
+    def apps(self):
+        return {row["name"]: row["command"] for row in self._query("SELECT name, command FROM apps")}
+
+    def set_app(self, name, command):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO apps (name, command) VALUES (?, ?)", (name, command))
+
+    def remove_app(self, name):
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM apps WHERE name = ?", (name,)).rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Change detection, migration
+    def _version(self):
+        return self._query("PRAGMA data_version")[0][0]
+
+    def changed_externally(self):
+        """True once per batch of commits made by other connections (e.g. the API server)"""
+        version = self._version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def migrate_json(self, json_path="agent_memory.json"):
+        """
+        Import agent_memory.json (+ its journal) once, then rename both to
+        *.migrated so nothing keeps writing to them. Returns the number of
+        imported rows, or None if there was nothing to migrate.
+        """
+        if self._query("SELECT 1 FROM meta WHERE key = 'json_migrated'"):
+            return None
+        journal_path = memory_store.journal_path_for(json_path)
+        if not (os.path.exists(json_path) or os.path.exists(journal_path)):
+            return None
+        data = memory_store.load(json_path, journal_path)
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return None               # another process migrated it meanwhile
+            conn.executemany("INSERT INTO tasks (task, done, added) VALUES (?, ?, ?)",
+                             [(t["task"], int(bool(t.get("done"))), t.get("added") or "")
+                              for t in data.get("tasks", [])])
+            conn.executemany("INSERT INTO notes (note, time) VALUES (?, ?)",
+                             [(n["note"], n.get("time") or "") for n in data.get("notes", [])])
+            conn.executemany("INSERT OR REPLACE INTO apps (name, command) VALUES (?, ?)",
+                             list(data.get("apps", {}).items()))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                         (datetime.now().isoformat(),))
+        for path in (json_path, journal_path):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        return len(data.get("tasks", [])) + len(data.get("notes", [])) + len(data.get("apps", {}))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate agent_memory.json into agent_memory.db")
+    parser.add_argument("--json", default="agent_memory.json")
+    parser.add_argument("--db", default="agent_memory.db")
+    args = parser.parse_args()
+
+    db = MemoryDB(args.db)
+    count = db.migrate_json(args.json)
+    if count is None:
+        print("Nothing to migrate")
+    else:
+        print(f"Migrated {count} rows into {args.db}")
+    print(f"{db.count_pending_tasks()} pending tasks, {db.count_notes()} notes, {len(db.apps())} apps")
+    db.close()
@@ -0,0 +1,57 @@
+"""
+MEMORY STORE - Loader for the legacy JSON snapshot + append-only journal
+Before agent_memory.db, every mutation was one JSON line appended to
+<snapshot>.journal.jsonl and the snapshot (agent_memory.json) was only
+rewritten once the journal had grown as large as it. The agents and the
+API server now use memory_db.py; this module only reads the old files back
+for the one-time migration. Records already folded into the snapshot
+(seq <= its _seq) are skipped, and a torn last line from a crash is
+ignored. Nothing here writes to the files.
+"""
+
+import json
+import os
+
+EMPTY = {"tasks": [], "notes": [], "apps": {}}
+
+
+def journal_path_for(path):
+    return os.path.splitext(path)[0] + ".journal.jsonl"
+
+
+def _apply(data, record):
+    op, table = record["op"], record["table"]
+    if op == "add":
+        data.setdefault(table, []).append(record["item"])
+    elif op == "update":
+        data[table][record["index"]].update(record["fields"])
+    elif op == "delete":
+        data[table].pop(record["index"])
+    elif op == "set":
+        data.setdefault(table, {})[record["key"]] = record["value"]
+    elif op == "unset":
+        data.get(table, {}).pop(record["key"], None)
+
+
+def load(path="agent_memory.json", journal_path=None):
+    """Tasks, notes and apps as of the last complete journal record"""
+    journal_path = journal_path or journal_path_for(path)
+    data = json.loads(json.dumps(EMPTY))
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data.update(json.load(f))
+    seq = data.pop("_seq", 0)
+    if not os.path.exists(journal_path):
+        return data
+    with open(journal_path, "rb") as f:
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated record")
+                record = json.loads(line)
+            except ValueError:
+                break                     # torn write from a crash: drop it and what follows
+            if record["seq"] > seq:
+                _apply(data, record)
+                seq = record["seq"]
+    return data
@@ -0,0 +1,73 @@
+"""
+MODEL LOADER - Background model loading and warm-up
+Builds a model on a worker thread while the rest of the agent starts, then
+runs a warm-up call so lazy allocations (CTranslate2 buffers, kernel
+selection) happen before the first real command instead of during it.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class BackgroundModelLoader:
+    """
+    Load a model in the background
+
+    factory()      -> model, run on the worker thread
+    warmup(model)  -> optional, run right after loading
+    get() blocks until both are done and re-raises any load error.
+    """
+
+    def __init__(self, name, factory, warmup=None):
+        self.name = name
+        self.factory = factory
+        self.warmup = warmup
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._done.is_set() and self.error is None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"load-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            start = time.perf_counter()
+            model = self.factory()
+            self.load_seconds = time.perf_counter() - start
+            if self.warmup is not None:
+                start = time.perf_counter()
+                self.warmup(model)
+                self.warmup_seconds = time.perf_counter() - start
+            self.model = model
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def get(self, timeout=None):
+        """Wait for the model (loaded and warmed up) and return it"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} still loading after {timeout}s")
+        if self.error is not None:
+            raise self.error
+        return self.model
+
+
+def warmup_whisper(model, decode_options=None, sample_rate=16000, seconds=1.0):
+    """Decode a short synthetic clip so the first real transcribe is at steady state"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    clip = (0.1 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 2 * t) > 0)).astype(np.float32)
+    segments, _ = model.transcribe(clip, **(decode_options or {"language": "en"}))
+    for _ in segments:  # segments are lazy; force the decode
+        pass
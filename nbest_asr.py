@@ -0,0 +1,150 @@
+"""
+N-BEST ASR - Several Whisper hypotheses, rescored by the command classifier
+Whisper's beam search already explores alternatives like "show notes" next
+to "show nodes"; transcribe() normally keeps only the top one. Here the beam
+returns its N best sequences with their log-probabilities and each one is
+scored by the CommandClassifier, so a slightly less likely transcript that
+is a valid command wins over a likelier one that is not, instead of costing
+a "can you repeat?" round-trip.
+"""
+
+import math
+import re
+import time
+
+
+class NBestTranscriber:
+    """
+    Single-window (<= 30 s) N-best decoding on a faster-whisper WhisperModel
+
+    classify(text) -> classify_command-style dict ('is_valid', 'confidence').
+    Hypotheses the classifier accepts always beat rejected ones; among equals
+    the joint score  asr_weight * log P(hypothesis | N-best) + log(confidence)
+    decides. If none is accepted the ASR top hypothesis is returned, so the
+    caller's normal low-confidence handling still applies.
+    """
+
+    def __init__(self, model, classify, num_hypotheses=5, decode_options=None,
+                 asr_weight=1.0, min_confidence=1e-3):
+        self.model = model
+        self.classify = classify
+        self.num_hypotheses = num_hypotheses
+        self.decode_options = dict(decode_options or {"language": "en", "beam_size": 5})
+        self.asr_weight = asr_weight
+        self.min_confidence = min_confidence
+
+        self.utterances = 0
+        self.reranked = 0      # utterances where a lower-ranked hypothesis won
+        self.decode_seconds = 0.0
+
+    def _tokenizer(self, language):
+        from faster_whisper.tokenizer import Tokenizer
+        return Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                         task="transcribe", language=language)
+
+    def hypotheses(self, audio, options=None):
+        """
+        Decode the first 30 s of `audio` (float32, 16 kHz mono) and return
+        up to num_hypotheses [(text, avg_logprob, cum_logprob)], best first
+        """
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.transcribe import get_suppressed_tokens
+
+        options = dict(self.decode_options, **(options or {}))
+        model = self.model
+        tokenizer = self._tokenizer(options.get("language") or "en")
+
+        features = model.feature_extractor(audio)
+        encoder_output = model.encode(pad_or_trim(features[:, :model.feature_extractor.nb_max_frames]))
+
+        previous_tokens = []
+        if options.get("initial_prompt"):
+            previous_tokens = tokenizer.encode(" " + options["initial_prompt"].strip())
+        prompt = model.get_prompt(tokenizer, previous_tokens, without_timestamps=True,
+                                  hotwords=options.get("hotwords"))
+        max_length = min(model.max_length, len(prompt) + options.get("max_new_tokens", 48))
+        length_penalty = options.get("length_penalty") or 1.0
+
+        beam_size = max(options.get("beam_size", 5), self.num_hypotheses)
+        result = model.model.generate(
+            encoder_output, [prompt],
+            beam_size=beam_size,
+            num_hypotheses=self.num_hypotheses,
+            length_penalty=length_penalty,
+            max_length=max_length,
+            return_scores=True,
+            suppress_blank=options.get("suppress_blank", True),
+            suppress_tokens=list(get_suppressed_tokens(tokenizer, list(options.get("suppress_tokens", [-1])))),
+        )[0]
+
+        hypotheses = []
+        for tokens, score in zip(result.sequences_ids, result.scores):
+            # Undo CTranslate2's length normalization, as faster-whisper does
+            cum_logprob = score * (len(tokens) ** length_penalty)
+            text = tokenizer.decode(tokens).strip().lower()
+            hypotheses.append((text, cum_logprob / (len(tokens) + 1), cum_logprob))
+        return hypotheses
+
+    def rescore(self, hypotheses):
+        """
+        Classify each hypothesis and rank them jointly
+
+        Returns a list of dicts best first:
+        {'text', 'avg_logprob', 'asr_rank', 'classification', 'joint'}
+        """
+        # Posterior of each hypothesis within the N-best list (log-sum-exp)
+        if not hypotheses:
+            return []
+        peak = max(h[2] for h in hypotheses)
+        log_norm = peak + math.log(sum(math.exp(h[2] - peak) for h in hypotheses))
+
+        ranked = {}
+        for asr_rank, (text, avg_logprob, cum_logprob) in enumerate(hypotheses):
+            # Punctuation/case variants are the same command; keep the likeliest
+            key = re.sub(r"[^\w\s]", "", text).strip().lower()
+            if not key or key in ranked:
+                continue
+            classification = self.classify(key)
+            confidence = max(classification['confidence'], self.min_confidence)
+            ranked[key] = {
+                'text': key,
+                'avg_logprob': avg_logprob,
+                'asr_rank': asr_rank,
+                'classification': classification,
+                'joint': self.asr_weight * (cum_logprob - log_norm) + math.log(confidence)
+            }
+        return sorted(ranked.values(),
+                      key=lambda h: (h['classification']['is_valid'], h['joint']), reverse=True)
+
+    def transcribe(self, audio, bias=None):
+        """
+        Returns (text, info) with info =
+        {'hypotheses': rescore() list, 'asr_rank': rank of the winner in the
+         Whisper N-best (0 = Whisper's own choice), 'seconds': decode time}
+        bias: optional callable(options) -> options (e.g. CommandVocabularyBias.apply)
+        """
+        options = bias(self.decode_options) if bias is not None else self.decode_options
+        start = time.perf_counter()
+        hypotheses = self.hypotheses(audio, options)
+        seconds = time.perf_counter() - start
+        self.utterances += 1
+        self.decode_seconds += seconds
+
+        ranked = self.rescore(hypotheses)
+        if not ranked:
+            return "", {'hypotheses': [], 'asr_rank': None, 'seconds': seconds}
+        best = ranked[0]
+        # Nothing valid: keep Whisper's choice, the classifier will reject it anyway
+        if not best['classification']['is_valid']:
+            best = min(ranked, key=lambda h: h['asr_rank'])
+        if best['asr_rank'] > 0:
+            self.reranked += 1
+        return best['text'], {'hypotheses': ranked, 'asr_rank': best['asr_rank'], 'seconds': seconds}
+
+    def get_stats(self):
+        return {
+            'utterances': self.utterances,
+            'reranked': self.reranked,
+            'rerank_rate': self.reranked / self.utterances if self.utterances else 0.0,
+            'mean_decode_seconds': self.decode_seconds / self.utterances if self.utterances else None
+        }
@@ -0,0 +1,146 @@
+"""
+PIPELINE - Staged capture -> ASR -> classify -> act processing
+Each stage runs on its own worker thread and hands results to the next one
+through a bounded queue, so capturing the next utterance overlaps with
+decoding the previous one. One worker per stage plus FIFO queues keeps the
+actions in the order the utterances were spoken.
+"""
+
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class PipelineStage:
+    """
+    One worker thread: take from inbox, run func, put result on outbox
+
+    func(item) returning None drops the item (e.g. nothing recognized).
+    Puts to a full outbox block, which is what propagates backpressure.
+    """
+
+    def __init__(self, name, func, inbox, outbox=None, on_result=None):
+        self.name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.on_result = on_result
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._thread = threading.Thread(target=self._work, name=f"stage-{name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _STOP:
+                if self.outbox is not None:
+                    self.outbox.put(_STOP)
+                return
+            seq, payload = item
+            start = time.perf_counter()
+            try:
+                result = self.func(payload)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ {self.name} stage error (#{seq}): {e}")
+                continue
+            finally:
+                self.busy_seconds += time.perf_counter() - start
+            self.processed += 1
+            if result is None:
+                self.dropped += 1
+                continue
+            if self.on_result is not None:
+                self.on_result(seq, result)
+            if self.outbox is not None:
+                self.outbox.put((seq, result))
+
+
+class VoicePipeline:
+    """
+    Chain of PipelineStages connected by bounded queues
+
+    stages: list of (name, func) in order. submit() feeds the first stage
+    and returns False instead of blocking when the pipeline is full, so the
+    caller (the hotkey loop) stays responsive and can tell the user.
+    A final-stage result equal to `exit_value` sets exit_requested.
+    """
+
+    def __init__(self, stages, queue_size=2, exit_value="exit"):
+        self.exit_value = exit_value
+        self.exit_requested = threading.Event()
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.stages = []
+        for i, (name, func) in enumerate(stages):
+            last = i == len(stages) - 1
+            self.stages.append(PipelineStage(
+                name, func, self.queues[i],
+                outbox=None if last else self.queues[i + 1],
+                on_result=self._on_final if last else None
+            ))
+        self.submitted = 0
+        self.rejected = 0
+        self._started = False
+
+    def _on_final(self, seq, result):
+        if result == self.exit_value:
+            self.exit_requested.set()
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        self._started = True
+        return self
+
+    def submit(self, item, timeout=0):
+        """Queue an item for the first stage; False if the pipeline is full"""
+        try:
+            self.queues[0].put((self.submitted, item), timeout=timeout or None, block=bool(timeout))
+        except queue.Full:
+            self.rejected += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def stop(self, drain=True, timeout=None):
+        """Stop all workers; with drain=False, queued work is discarded first"""
+        if not self._started:
+            return
+        if not drain:
+            for q in self.queues:
+                try:
+                    while True:
+                        q.get_nowait()
+                except queue.Empty:
+                    pass
+        self.queues[0].put(_STOP)
+        for stage in self.stages:
+            stage.join(timeout)
+        self._started = False
+
+    def get_stats(self):
+        """Per-stage counters and current queue depths"""
+        return {
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'stages': {
+                stage.name: {
+                    'processed': stage.processed,
+                    'dropped': stage.dropped,
+                    'errors': stage.errors,
+                    'busy_seconds': stage.busy_seconds,
+                    'queued': stage.inbox.qsize()
+                }
+                for stage in self.stages
+            }
+        }
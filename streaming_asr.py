@@ -0,0 +1,154 @@
+"""
+STREAMING ASR - Incremental Whisper decoding while the hotkey is held
+Decodes the growing capture buffer in fixed-size chunks on a worker thread.
+Segments that end well before the live edge are committed and never decoded
+again, so on release only the uncommitted tail is left to finalize.
+"""
+
+import threading
+
+import numpy as np
+
+
+class StreamingTranscriber:
+    """
+    Chunked, prefix-reusing transcription over an AudioCapture
+
+    Every `chunk_seconds` of new audio, the uncommitted window (audio after
+    the last committed segment) is decoded. Segments ending more than
+    `holdback_seconds` before the end of the window are committed: their
+    text is kept, the window start moves past them, and the committed text
+    is passed as the prompt for the next decode (after any initial_prompt
+    in the decode options, e.g. the command-vocabulary bias).
+
+    Listeners registered with subscribe() are called with every partial
+    hypothesis (committed + tentative text) from the worker thread.
+    """
+
+    def __init__(self, model, sample_rate=16000, chunk_seconds=1.0,
+                 holdback_seconds=1.0, decode_options=None):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.chunk_samples = int(chunk_seconds * sample_rate)
+        self.holdback_seconds = holdback_seconds
+        self.decode_options = dict(decode_options or {"language": "en"})
+        self.listeners = []
+
+        self._capture = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        self.committed_text = []     # committed segment texts
+        self.committed_position = 0  # absolute capture position after them
+        self.partial_text = ""
+        self.chunks_decoded = 0
+        self._decoded_until = 0      # capture position covered by the last decode
+
+    @property
+    def active(self):
+        return self._thread is not None
+
+    def subscribe(self, callback):
+        """Register callback(text) for partial hypotheses"""
+        self.listeners.append(callback)
+
+    def start(self, capture, decode_options=None):
+        """
+        Start decoding `capture` in the background (call after capture.start())
+
+        decode_options, if given, replace the constructor's from now on.
+        """
+        self.cancel()
+        self._reset()
+        if decode_options is not None:
+            self.decode_options = dict(decode_options)
+        self._capture = capture
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the worker and discard its state"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._capture = None
+
+    def finish(self, audio):
+        """
+        Finalize after recording stops
+
+        `audio` is the complete utterance (1-D mono) returned by the capture;
+        only the part after the committed prefix is decoded here.
+        Returns the full transcript.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        offset = 0
+        if self._capture is not None:
+            # Absolute position of audio[0] (non-zero only after an overflow)
+            offset = self._capture.buffer.total_written - len(audio)
+            self._capture = None
+
+        tail = audio[max(0, self.committed_position - offset):]
+        text = self._join(self.committed_text)
+        if len(tail):
+            tail_text = self._join(s.text for s in self._decode(tail))
+            text = self._join([text, tail_text])
+        self.partial_text = text
+        return text
+
+    # ------------------------------------------------------------------
+    def _worker(self):
+        poll = self.chunk_samples / self.sample_rate / 4
+        while not self._stop.wait(poll):
+            audio, end = self._capture.read_since(self.committed_position)
+            if end - self._decoded_until < self.chunk_samples:
+                continue
+            self._decode_chunk(self._to_mono(audio), end)
+
+    def _decode_chunk(self, window, end):
+        segments = list(self._decode(window))
+        self._decoded_until = end
+        self.chunks_decoded += 1
+
+        window_seconds = len(window) / self.sample_rate
+        tentative = []
+        commit_until = 0.0
+        for segment in segments:
+            if not tentative and segment.end <= window_seconds - self.holdback_seconds:
+                self.committed_text.append(segment.text)
+                commit_until = segment.end
+            else:
+                tentative.append(segment.text)
+        # The window starts at committed_position; advance past the new commits
+        self.committed_position += int(commit_until * self.sample_rate)
+
+        self.partial_text = self._join([self._join(self.committed_text), self._join(tentative)])
+        if self.partial_text:
+            for callback in self.listeners:
+                try:
+                    callback(self.partial_text)
+                except Exception as e:
+                    print(f"⚠️ Partial transcript listener error: {e}")
+
+    def _decode(self, audio):
+        options = dict(self.decode_options)
+        prompt = self._join(self.committed_text)
+        if prompt:
+            options["initial_prompt"] = " ".join(filter(None, [options.get("initial_prompt"), prompt]))
+        segments, _ = self.model.transcribe(np.ascontiguousarray(audio, dtype=np.float32), **options)
+        return segments
+
+    @staticmethod
+    def _to_mono(audio):
+        return audio[:, 0] if audio.shape[1] == 1 else audio.mean(axis=1)
+
+    @staticmethod
+    def _join(texts):
+        return " ".join(" ".join(t.strip() for t in texts).split()).lower()
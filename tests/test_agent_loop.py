@@ -0,0 +1,87 @@
+"""
+Drives VoiceAgent.run() end to end with ScriptedHotkey, a scripted capture,
+a stand-in Whisper model and the silent TTS backend. Skipped where the
+agents' runtime packages (sounddevice/PortAudio, pyautogui, ...) are missing.
+"""
+
+import importlib
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from audio_capture import AudioCapture
+from hotkey import PRESS, RELEASE, ScriptedHotkey
+from memory_db import MemoryDB
+
+REQUIRED = ("faster_whisper", "sounddevice", "numpy", "keyboard", "soundfile", "pyautogui")
+
+
+def import_agent(name):
+    missing = [module for module in REQUIRED if importlib.util.find_spec(module) is None]
+    if missing:
+        pytest.skip(f"{name} needs {', '.join(missing)}")
+    try:
+        return importlib.import_module(name)
+    except (ImportError, OSError, KeyError) as e:   # e.g. no PortAudio, no display
+        pytest.skip(f"{name} cannot be imported here: {e!r}")
+
+
+class ScriptedCapture(AudioCapture):
+    """Delivers one prepared clip per press instead of reading a microphone"""
+
+    def __init__(self, clips, **kwargs):
+        super().__init__(**kwargs)
+        self.clips = list(clips)
+
+    def open(self):
+        self.stream = self
+
+    def close(self):
+        with self._lock:
+            self._gate = False
+        self.stream = None
+
+    def start(self):
+        super().start()
+        clip = self.clips.pop(0)
+        self._callback(clip.reshape(-1, 1), len(clip), None, None)
+
+
+class FakeWhisper:
+    """transcribe() returns the next scripted text, whatever the audio"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def transcribe(self, audio, **options):
+        return iter([SimpleNamespace(text=self.texts.pop(0))]), SimpleNamespace(language="en")
+
+
+def voiced_clip(seconds=1.0, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("module_name", ["agent_final", "agent_with_classifier"])
+def test_run_press_release_exit(module_name, tmp_path, monkeypatch):
+    module = import_agent(module_name)
+    monkeypatch.chdir(tmp_path)
+    script = [(0.05, PRESS), (0.05, RELEASE), (0.05, PRESS), (0.05, RELEASE)]
+    agent = module.VoiceAgent(
+        hotkey_source=ScriptedHotkey(script),
+        whisper_model=FakeWhisper(["add task buy milk", "exit"]),
+        capture=ScriptedCapture([voiced_clip(), voiced_clip()]),
+        tts_backend="silent", tts_cache_dir=None
+    )
+    agent.run()
+
+    spoken = agent.tts.backend.spoken
+    assert "Added task: buy milk" in spoken
+    assert "Goodbye" in spoken
+    assert spoken[-1] == "Agent stopped"
+    db = MemoryDB(os.path.join(tmp_path, "agent_memory.db"))
+    assert [task["task"] for task in db.pending_tasks()] == ["buy milk"]
+    db.close()
@@ -0,0 +1,41 @@
+import pytest
+
+from app_index import AppNameIndex, levenshtein
+
+APPS = ["notepad", "calculator", "chrome", "visual studio code", "spotify", "file explorer",
+        "task manager", "paint", "word", "excel", "powerpoint", "outlook"]
+
+
+@pytest.mark.parametrize("scan_below", [0, 1000])     # trigram candidates / scan every name
+@pytest.mark.parametrize("spoken, expected", [
+    ("note pad", "notepad"),
+    ("calculater", "calculator"),
+    ("studio code", "visual studio code"),
+    ("chrome please", "chrome"),
+    ("spoti", "spotify"),
+])
+def test_lookup(spoken, expected, scan_below):
+    index = AppNameIndex(APPS, scan_below=scan_below)
+    assert index.lookup(spoken)[0][0] == expected
+
+
+def test_scan_and_index_agree():
+    scan = AppNameIndex(APPS, scan_below=1000, cache_size=0)
+    indexed = AppNameIndex(APPS, scan_below=0, cache_size=0)
+    for spoken in ("exel", "power point", "paint brush", "task manger", "outlok", "xyz"):
+        assert scan.lookup(spoken)[:1] == indexed.lookup(spoken)[:1]
+
+
+def test_cache_hits_and_rebuild():
+    index = AppNameIndex(APPS)
+    first = index.lookup("calculater")
+    assert index.lookup("calculater") == first
+    assert (index.cache_hits, index.cache_misses) == (1, 1)
+    index.build(["calculate it"])
+    assert index.lookup("calculater")[0][0] == "calculate it"
+
+
+def test_levenshtein():
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("", "abc") == 3
+    assert levenshtein("abcdef", "a", max_distance=2) == 3
@@ -0,0 +1,39 @@
+import numpy as np
+
+from keyword_spotter import KeywordSpotter
+
+SAMPLE_RATE = 16000
+
+
+def sweep(rng, start_hz, end_hz, seconds=0.6):
+    """A rising or falling tone with some noise, as a stand-in for a phrase"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    freq = np.linspace(start_hz, end_hz, len(t)) * rng.uniform(0.97, 1.03)
+    audio = 0.3 * np.sin(2 * np.pi * np.cumsum(freq) / SAMPLE_RATE)
+    return (audio + rng.standard_normal(len(t)) * 0.01).astype(np.float32)
+
+
+def enrolled_spotter(rng, **kwargs):
+    spotter = KeywordSpotter(SAMPLE_RATE, **kwargs)
+    for _ in range(3):
+        spotter.enroll("volume up", sweep(rng, 300, 1500))
+        spotter.enroll("shutdown", sweep(rng, 1500, 300))
+    spotter.calibrate()
+    return spotter
+
+
+def test_spots_enrolled_phrase():
+    rng = np.random.default_rng(0)
+    spotter = enrolled_spotter(rng)
+    label, info = spotter.spot(sweep(rng, 300, 1500))
+    assert label == "volume up"
+    assert info['distance'] <= spotter.threshold
+
+
+def test_whisper_only_label_is_never_returned():
+    rng = np.random.default_rng(0)
+    spotter = enrolled_spotter(rng, whisper_only={"shutdown"})
+    label, info = spotter.spot(sweep(rng, 1500, 300))
+    assert label is None
+    assert info['label'] == "shutdown"          # still the nearest phrase
+    assert spotter.get_stats()['fallbacks'] == 1
@@ -0,0 +1,59 @@
+import json
+import os
+
+import memory_store
+from memory_db import MemoryDB
+
+
+def write_legacy(folder):
+    """Snapshot with one task (_seq 1) and a journal with later mutations plus a torn tail"""
+    path = os.path.join(folder, "agent_memory.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tasks": [{"task": "a", "done": False, "added": "x"}], "notes": [], "apps": {}, "_seq": 1}, f)
+    records = [
+        {"seq": 1, "op": "add", "table": "tasks", "item": {"task": "a", "done": False, "added": "x"}},
+        {"seq": 2, "op": "add", "table": "tasks", "item": {"task": "b", "done": False, "added": "y"}},
+        {"seq": 3, "op": "update", "table": "tasks", "index": 0, "fields": {"done": True}},
+        {"seq": 4, "op": "add", "table": "notes", "item": {"note": "n", "time": "t"}},
+        {"seq": 5, "op": "set", "table": "apps", "key": "foo", "value": "foo.exe"},
+        {"seq": 6, "op": "delete", "table": "tasks", "index": 1},
+    ]
+    with open(memory_store.journal_path_for(path), "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(r) + "\n" for r in records)
+        f.write('{"seq": 7, "op": "add"')
+    return path
+
+
+def test_load_replays_journal_without_touching_files(tmp_path):
+    path = write_legacy(tmp_path)
+    journal = memory_store.journal_path_for(path)
+    before = open(journal, "rb").read()
+    data = memory_store.load(path)
+    assert data == {"tasks": [{"task": "a", "done": True, "added": "x"}],
+                    "notes": [{"note": "n", "time": "t"}], "apps": {"foo": "foo.exe"}}
+    assert open(journal, "rb").read() == before
+
+
+def test_migrate_json_once(tmp_path):
+    path = write_legacy(tmp_path)
+    db = MemoryDB(os.path.join(tmp_path, "agent_memory.db"))
+    assert db.migrate_json(path) == 3
+    assert not os.path.exists(path) and os.path.exists(path + ".migrated")
+    assert db.pending_tasks() == []
+    assert [n["note"] for n in db.recent_notes()] == ["n"]
+    assert db.apps() == {"foo": "foo.exe"}
+    write_legacy(tmp_path)
+    assert db.migrate_json(path) is None             # meta row: never imported twice
+    db.close()
+
+
+def test_pending_task_numbers(tmp_path):
+    db = MemoryDB(os.path.join(tmp_path, "agent_memory.db"))
+    for text in ("one", "two", "three"):
+        db.add_task(text)
+    assert db.complete_task(2)["task"] == "two"
+    assert [t["task"] for t in db.pending_tasks()] == ["one", "three"]
+    assert db.delete_task(2)["task"] == "three"
+    assert db.complete_task(5) is None
+    assert db.count_pending_tasks() == 1
+    db.close()
@@ -0,0 +1,66 @@
+import time
+
+from tts import AudioCache, SilentBackend, SpeechWorker, make_backend, split_sentences
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_split_sentences():
+    assert split_sentences("You have 2 tasks. 1. buy milk! Done?") == ["You have 2 tasks.", "1. buy milk!", "Done?"]
+    assert split_sentences("Version 3.5 is out") == ["Version 3.5 is out"]
+    assert split_sentences("  ") == []
+
+
+def test_make_backend_silent():
+    assert isinstance(make_backend("silent"), SilentBackend)
+
+
+def test_speaks_in_order_sentence_by_sentence():
+    backend = SilentBackend()
+    worker = SpeechWorker(backend).start()
+    worker.say("You have 2 tasks. First one.")
+    for i in range(5):
+        worker.say(f"item {i}")
+    assert worker.wait_idle(timeout=5)
+    worker.close()
+    assert backend.spoken == ["You have 2 tasks.", "First one."] + [f"item {i}" for i in range(5)]
+    stats = worker.get_stats()
+    assert stats['spoken'] == 6
+    assert stats['time_to_first_audio']['count'] == 6
+
+
+def test_interrupt_cuts_current_and_drops_queued():
+    backend = SilentBackend(simulate=True, words_per_minute=60)      # one second per word
+    worker = SpeechWorker(backend).start()
+    for i in range(5):
+        worker.say(f"long reply number {i}")
+    wait_for(lambda: backend.spoken)
+    worker.interrupt()
+    assert worker.wait_idle(timeout=2)
+    worker.say("new command")
+    assert worker.wait_idle(timeout=10)
+    worker.close()
+    assert backend.spoken == ["long reply number 0", "new command"]
+    stats = worker.get_stats()
+    assert (stats['interrupts'], stats['cut_short'], stats['stale_dropped']) == (1, 1, 4)
+
+
+def test_prewarm_never_blocks_and_yields_to_speech(tmp_path):
+    backend = SilentBackend()
+    worker = SpeechWorker(backend, cache=AudioCache(str(tmp_path))).start()
+    start = time.perf_counter()
+    assert worker.prewarm([f"phrase {i}" for i in range(100)]) == 100
+    assert time.perf_counter() - start < 0.5
+    worker.say("Ready")
+    wait_for(lambda: worker.get_stats()['renders_pending'] == 0, timeout=30)
+    worker.say("phrase 3")
+    assert worker.wait_idle(timeout=5)
+    worker.close()
+    assert backend.spoken == ["Ready"]
+    assert len(backend.played) == 1                  # "phrase 3" came from the cache
+    assert worker.get_stats()['rendered'] == 100
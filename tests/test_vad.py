@@ -0,0 +1,40 @@
+import numpy as np
+
+from vad import EnergyVAD
+
+
+def tone(seconds, sample_rate=16000, amplitude=0.3, frequency=150):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def test_dilate_keeps_mask_length_for_masks_shorter_than_kernel():
+    vad = EnergyVAD()
+    mask = np.array([False, False, True, False, False])
+    dilated = vad._dilate(mask, vad.hangover_frames)
+    assert dilated.shape == mask.shape
+    assert dilated.all()
+
+
+def test_dilate_extends_each_side_by_frames():
+    vad = EnergyVAD()
+    mask = np.zeros(20, dtype=bool)
+    mask[10] = True
+    dilated = vad._dilate(mask, 2)
+    assert np.flatnonzero(dilated).tolist() == [8, 9, 10, 11, 12]
+
+
+def test_process_five_frame_voiced_clip():
+    vad = EnergyVAD(min_speech_ms=20)
+    clip = tone(5 * vad.frame_size / vad.sample_rate)
+    assert len(vad.speech_frames(clip)) == 5
+    trimmed, report = vad.process(clip)
+    assert report['speech']
+    assert trimmed is not None and len(trimmed) == len(clip)
+
+
+def test_process_rejects_silence():
+    vad = EnergyVAD()
+    trimmed, report = vad.process(np.zeros(16000, dtype=np.float32))
+    assert trimmed is None
+    assert not report['speech']
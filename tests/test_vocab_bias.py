@@ -0,0 +1,30 @@
+import re
+
+from command_classifier import CommandClassifier
+from vocab_bias import CommandVocabularyBias
+
+
+def group_names(templates):
+    return {name for cfg in templates.values() for name in re.findall(r"\(\?P<(\w+)>", cfg["pattern"])}
+
+
+def test_prompt_has_no_regex_group_names():
+    templates = CommandClassifier().command_templates
+    names = group_names(templates)
+    assert {"app", "number"} <= names         # only ever group names, never spoken
+    bias = CommandVocabularyBias(templates, app_names=["notepad"])
+    words = set(re.findall(r"[a-z]+", bias.initial_prompt + " " + bias.hotwords))
+    assert not {"app", "number"} & words
+
+
+def test_template_words_keep_pattern_words():
+    config = {"pattern": r"^(?:open|launch)\s+(?P<app>.+)$", "keywords": ["open"]}
+    assert CommandVocabularyBias._template_words(config) == ["open", "launch"]
+
+
+def test_apply_without_limits_keeps_timestamps():
+    bias = CommandVocabularyBias(phrases=["open"], app_names=["chrome"])
+    options = bias.apply({"language": "en"}, limits=False)
+    assert options["hotwords"] == "chrome"
+    assert "without_timestamps" not in options
+    assert bias.apply({"language": "en"})["without_timestamps"] is True
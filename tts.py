@@ -0,0 +1,595 @@
+"""
+TTS - One long-lived speech worker fed by an ordered queue
+speak() used to start a new PowerShell + .NET SpeechSynthesizer for every
+sentence (hundreds of ms each), and several sentences started together
+talked over each other. Here one worker thread owns one backend (a
+persistent PowerShell process, pyttsx3, or a silent stand-in) and speaks
+queued utterances strictly in order.
+
+Constant replies ("Volume increased", "Ready. Press F2 to talk.") can be
+rendered once to WAV files in an AudioCache and are then played straight
+from disk instead of being synthesized again.
+
+Barge-in: interrupt() cuts the current utterance short (backend.stop()) and
+drops everything queued before it, so pressing the hotkey silences a long
+task readout within tens of milliseconds. Uncached text is spoken one
+sentence at a time, and an interrupt never lets the next sentence start.
+"""
+
+import hashlib
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+_STOP = object()
+_WAKE = object()     # nudges an idle worker to look at pending renders
+# Sentence ends, but not list numbers like "1. Buy milk"
+_SENTENCE_END = re.compile(r"(?<=[^\d\s][.!?])\s+")
+
+
+def split_sentences(text):
+    return [part for part in _SENTENCE_END.split(text.strip()) if part]
+
+
+class TTSBackend:
+    """
+    Speech backend interface, only ever used from the worker thread
+
+    speak(text, on_start) blocks until the utterance has finished and calls
+    on_start() once audio output begins (used for time-to-first-audio).
+    Backends that can synthesize to a file set can_render and implement
+    render(text, path); play(path, on_start) plays such a WAV file.
+    stop() may be called from any thread and makes a running speak() or
+    play() return early.
+    """
+
+    name = "base"
+    can_render = False
+    _playing = False
+
+    def start(self):
+        pass
+
+    def voice_key(self):
+        """Everything that changes how a text sounds (part of the cache key)"""
+        return self.name
+
+    def speak(self, text, on_start):
+        raise NotImplementedError
+
+    def render(self, text, path):
+        raise NotImplementedError
+
+    def play(self, path, on_start):
+        import sounddevice as sd
+        import soundfile as sf
+        audio, rate = sf.read(path, dtype="float32")
+        self._playing = True
+        try:
+            sd.play(audio, rate)
+            on_start()
+            sd.wait()
+        finally:
+            self._playing = False
+
+    def stop(self):
+        if self._playing:
+            import sounddevice as sd
+            sd.stop()
+
+    def close(self):
+        pass
+
+
+class PowerShellBackend(TTSBackend):
+    """
+    One persistent PowerShell process holding a SpeechSynthesizer
+
+    Each request is one tab-separated line on its stdin: SAY<tab>text, or
+    RENDER<tab>path<tab>text to write a WAV file. It answers START when the
+    synthesizer begins speaking and DONE when the request has finished.
+    SAY uses SpeakAsync while the next stdin line is read asynchronously, so
+    a STOP line cancels the utterance (SpeakAsyncCancelAll) mid-sentence.
+    """
+
+    name = "powershell"
+    can_render = True
+    SCRIPT = (
+        "[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+        "Add-Type -AssemblyName System.Speech; "
+        "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
+        "$in = New-Object IO.StreamReader([Console]::OpenStandardInput(), [Text.Encoding]::UTF8); "
+        "$next = $in.ReadLineAsync(); "
+        "while (($line = $next.Result) -ne $null) { "
+        "$next = $in.ReadLineAsync(); "
+        "$parts = $line.Split([char[]]@([char]9), 3); "
+        "if ($parts[0] -eq 'RENDER') { "
+        "$s.SetOutputToWaveFile($parts[1]); $s.Speak($parts[2]); $s.SetOutputToDefaultAudioDevice(); "
+        "[Console]::Out.WriteLine('DONE'); [Console]::Out.Flush() "
+        "} elseif ($parts[0] -eq 'SAY') { "
+        "[Console]::Out.WriteLine('START'); [Console]::Out.Flush(); "
+        "$p = $s.SpeakAsync($parts[1]); "
+        "while (-not $p.IsCompleted) { "
+        "if ($next.Wait(10)) { "
+        "if ($next.Result -eq $null) { break }; "
+        "if ($next.Result -eq 'STOP') { $s.SpeakAsyncCancelAll() }; "
+        "$next = $in.ReadLineAsync() } }; "
+        "[Console]::Out.WriteLine('DONE'); [Console]::Out.Flush() } }"
+    )
+
+    def __init__(self, executable="powershell"):
+        self.executable = executable
+        self.process = None
+        self._speaking = False
+        self._write_lock = threading.Lock()
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [self.executable, "-NoProfile", "-NoLogo", "-NonInteractive", "-Command", self.SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            encoding="utf-8", bufsize=1
+        )
+
+    def _expect(self, token):
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("PowerShell speech process exited")
+        if line.strip() != token:
+            return self._expect(token)
+
+    def _send(self, *fields):
+        if self.process is None or self.process.poll() is not None:
+            self.start()   # first use, or the process died: one restart per request
+        with self._write_lock:
+            self.process.stdin.write("\t".join(" ".join(field.split()) for field in fields) + "\n")
+            self.process.stdin.flush()
+
+    def speak(self, text, on_start):
+        self._send("SAY", text)
+        self._expect("START")
+        self._speaking = True
+        try:
+            on_start()
+            self._expect("DONE")
+        finally:
+            self._speaking = False
+
+    def stop(self):
+        super().stop()
+        if self._speaking:
+            # A STOP that arrives after DONE is ignored by the script
+            with self._write_lock:
+                try:
+                    self.process.stdin.write("STOP\n")
+                    self.process.stdin.flush()
+                except (OSError, ValueError):
+                    pass
+
+    def render(self, text, path):
+        self._send("RENDER", os.path.abspath(path), text)
+        self._expect("DONE")
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """
+    pyttsx3 engine created on (and only used from) the worker thread
+
+    stop() only raises a flag; the engine is stopped from its own word
+    callback, so speech ends at the next word boundary.
+    """
+
+    name = "pyttsx3"
+    can_render = True
+
+    def __init__(self, rate=None, voice=None):
+        self.rate = rate
+        self.voice = voice
+        self.engine = None
+        self._on_start = None
+        self._stop_requested = False
+
+    def start(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        if self.rate:
+            self.engine.setProperty("rate", self.rate)
+        if self.voice:
+            self.engine.setProperty("voice", self.voice)
+        self.engine.connect("started-utterance", lambda name: self._on_start and self._on_start())
+        self.engine.connect("started-word", self._on_word)
+
+    def _on_word(self, name, location, length):
+        if self._stop_requested:
+            self.engine.stop()
+
+    def voice_key(self):
+        return f"{self.name}|{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}"
+
+    def speak(self, text, on_start):
+        self._on_start = on_start
+        self._stop_requested = False
+        self.engine.say(text)
+        self.engine.runAndWait()
+        self._on_start = None
+
+    def stop(self):
+        super().stop()
+        self._stop_requested = True
+
+    def render(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.stop()
+
+
+class SilentBackend(TTSBackend):
+    """
+    Stand-in for machines without speech output (Linux, tests/test_tts.py)
+
+    Records every utterance in `spoken` (cached WAVs in `played`), optionally
+    appends it to `output_path`, and with simulate=True sleeps for the time
+    the text would take to say at `words_per_minute`. render() writes
+    silence of that length.
+    """
+
+    name = "silent"
+    can_render = True
+
+    def __init__(self, output_path=None, simulate=False, words_per_minute=180, sample_rate=16000):
+        self.output_path = output_path
+        self.simulate = simulate
+        self.words_per_minute = words_per_minute
+        self.sample_rate = sample_rate
+        self.spoken = []
+        self.played = []
+        self._stopped = threading.Event()
+
+    def _duration(self, text):
+        return len(text.split()) * 60.0 / self.words_per_minute
+
+    def speak(self, text, on_start):
+        self._stopped.clear()
+        on_start()
+        self.spoken.append(text)
+        if self.output_path:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(text + "\n")
+        if self.simulate:
+            self._stopped.wait(self._duration(text))
+
+    def render(self, text, path):
+        import numpy as np
+        import soundfile as sf
+        sf.write(path, np.zeros(int(self._duration(text) * self.sample_rate), dtype=np.float32),
+                 self.sample_rate, format="WAV")
+
+    def play(self, path, on_start):
+        self._stopped.clear()
+        on_start()
+        self.played.append(path)
+        if self.simulate:
+            import soundfile as sf
+            self._stopped.wait(sf.info(path).duration)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def make_backend(name="auto"):
+    """'auto' = PowerShell on Windows, else pyttsx3 if installed, else silent"""
+    if name == "auto":
+        if sys.platform == "win32":
+            return PowerShellBackend()
+        try:
+            import pyttsx3  # noqa: F401
+            return Pyttsx3Backend()
+        except ImportError:
+            return SilentBackend()
+    backends = {"powershell": PowerShellBackend, "pyttsx3": Pyttsx3Backend, "silent": SilentBackend}
+    return backends[name]()
+
+
+class AudioCache:
+    """
+    Disk-backed LRU cache of synthesized WAV files
+
+    Files are named by a hash of (voice key, text), so changing the voice or
+    rate never plays stale audio. Least recently played files are deleted
+    once the directory grows past max_bytes; the order survives restarts
+    because every hit touches the file's mtime.
+    """
+
+    def __init__(self, directory="tts_cache", max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()            # key -> size in bytes, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".tmp.wav"):
+                os.remove(path)                 # left over from an interrupted render
+            elif name.endswith(".wav"):
+                stat = os.stat(path)
+                found.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def key(text, voice):
+        return hashlib.sha1(f"{voice}\0{' '.join(text.split())}".encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, text, voice):
+        """Path of the cached WAV (marked most recently used), or None"""
+        key = self.key(text, voice)
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:                         # deleted behind our back
+            self.total_bytes -= self.entries.pop(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return path
+
+    def store(self, text, voice, render):
+        """Run render(tmp_path) and add the result; returns the cached path"""
+        key = self.key(text, voice)
+        tmp = os.path.join(self.directory, f"{key}.tmp.wav")
+        render(tmp)
+        path = self.path(key)
+        os.replace(tmp, path)
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)
+        self.entries[key] = os.path.getsize(path)
+        self.total_bytes += self.entries[key]
+        self._evict()
+        return path
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class SpeechWorker:
+    """
+    Single thread speaking queued utterances in order
+
+    say(text) returns immediately. Time-to-first-audio (say() -> backend
+    audio start, so it includes waiting behind earlier utterances) and the
+    backend's own start latency are kept for the last `history` utterances.
+    With an AudioCache (and a backend that can render), texts already in
+    the cache are played from disk; prewarm(texts) renders the fixed replies
+    in the background: renders wait in their own unbounded queue and are
+    only picked up while nothing is waiting to be spoken, so speech waits
+    at most for the one render in progress. interrupt() stops the current
+    utterance and marks everything queued so far as stale (dropped
+    unspoken).
+    """
+
+    def __init__(self, backend, queue_size=32, history=200, cache=None):
+        self.backend = backend
+        self.cache = cache if backend.can_render else None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._renders = deque()
+        self.spoken = 0
+        self.from_cache = 0
+        self.rendered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.interrupts = 0
+        self.cut_short = 0
+        self.stale_dropped = 0
+        self.time_to_first_audio = deque(maxlen=history)
+        self.start_latency = deque(maxlen=history)
+        self.stop_latency = deque(maxlen=history)
+        self._voice = None
+        self._generation = 0
+        self._interrupted_at = 0.0
+        self._started = threading.Event()
+        self._start_error = None
+        self._thread = threading.Thread(target=self._work, name="tts", daemon=True)
+
+    def start(self, timeout=10.0):
+        """Start the worker and its backend; raises if the backend fails to start"""
+        self._thread.start()
+        self._started.wait(timeout)
+        if self._start_error is not None:
+            raise self._start_error
+        return self
+
+    def say(self, text):
+        """Queue an utterance; False if the queue is full (the text is dropped)"""
+        try:
+            self.queue.put_nowait((text, time.perf_counter(), self._generation))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def prewarm(self, texts):
+        """Render texts that are not cached yet while the worker is idle (never blocks)"""
+        if self.cache is None:
+            return 0
+        voice = self._voice
+        missing = [t for t in dict.fromkeys(texts) if self.cache.key(t, voice) not in self.cache]
+        self._renders.extend(missing)
+        try:
+            self.queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass                        # busy speaking; renders are picked up once it is idle
+        return len(missing)
+
+    def interrupt(self):
+        """Barge-in: stop speaking now and drop everything queued before this call"""
+        self._interrupted_at = time.perf_counter()
+        self._generation += 1
+        self.interrupts += 1
+        self.backend.stop()
+
+    def wait_idle(self, timeout=None):
+        """Block until everything queued so far has been spoken"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.queue.unfinished_tasks:
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, drain=True, timeout=5.0):
+        if not self._thread.is_alive():
+            return
+        if drain:
+            self.wait_idle(timeout)
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _work(self):
+        try:
+            self.backend.start()
+        except Exception as e:
+            self._start_error = e
+            self._started.set()
+            return
+        self._voice = self.backend.voice_key()
+        self._started.set()
+        try:
+            while True:
+                if self._renders and self.queue.empty():
+                    self._render(self._renders.popleft())
+                    continue
+                item = self.queue.get()
+                if item is _STOP:
+                    self.queue.task_done()
+                    return
+                if item is _WAKE:
+                    self.queue.task_done()
+                    continue
+                text, queued_at, generation = item
+                began = time.perf_counter()
+                first_audio = []
+                try:
+                    if generation != self._generation:
+                        self.stale_dropped += 1
+                        continue
+                    # Only the first sentence counts for time-to-first-audio
+                    self._speak(text, generation,
+                                lambda: first_audio or first_audio.append(time.perf_counter()))
+                    if generation != self._generation:
+                        self.cut_short += 1
+                        self.stop_latency.append(time.perf_counter() - self._interrupted_at)
+                    else:
+                        self.spoken += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"⚠️ TTS error: {e}")
+                finally:
+                    self.queue.task_done()
+                if first_audio:
+                    self.time_to_first_audio.append(first_audio[0] - queued_at)
+                    self.start_latency.append(first_audio[0] - began)
+        finally:
+            self.backend.close()
+
+    def _render(self, text):
+        if self.cache.key(text, self._voice) in self.cache:
+            return
+        try:
+            self.cache.store(text, self._voice, lambda path: self.backend.render(text, path))
+            self.rendered += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ TTS render error: {e}")
+
+    def _speak(self, text, generation, on_start):
+        """Whole text from the cache if possible, else sentence by sentence"""
+        cached = self.cache.get(text, self._voice) if self.cache is not None else None
+        if cached is not None:
+            self.backend.play(cached, on_start)
+            self.from_cache += 1
+            return
+        for sentence in split_sentences(text):
+            if generation != self._generation:
+                return
+            self.backend.speak(sentence, on_start)
+
+    def get_stats(self):
+        """Counts and latency summaries (seconds) over recent utterances"""
+        def summary(samples):
+            if not samples:
+                return {'count': 0, 'mean': None, 'p50': None, 'p90': None}
+            ordered = sorted(samples)
+            return {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': ordered[len(ordered) // 2],
+                'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+            }
+
+        return {
+            'backend': self.backend.name,
+            'spoken': self.spoken,
+            'from_cache': self.from_cache,
+            'rendered': self.rendered,
+            'cache': self.cache.get_stats() if self.cache is not None else None,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'interrupts': self.interrupts,
+            'cut_short': self.cut_short,
+            'stale_dropped': self.stale_dropped,
+            'queued': self.queue.qsize(),
+            'renders_pending': len(self._renders),
+            'time_to_first_audio': summary(self.time_to_first_audio),
+            'backend_start_latency': summary(self.start_latency),
+            'stop_latency': summary(self.stop_latency)
+        }
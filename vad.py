@@ -0,0 +1,248 @@
+"""
+VAD - Voice activity detection before Whisper
+Vectorized NumPy energy / zero-crossing detector that rejects noise-only
+clips and trims silence (leading, trailing and long internal pauses), so
+Whisper only decodes the part of the clip that contains speech.
+UtteranceDetector applies a per-block version of the same gate to a live
+stream for hands-free listening.
+"""
+
+import queue
+import threading
+
+import numpy as np
+
+from audio_capture import AudioRingBuffer
+
+
+class EnergyVAD:
+    """
+    Frame-level energy + zero-crossing-rate speech detector
+
+    A frame counts as speech when its RMS energy clears an adaptive
+    threshold (max of a fixed floor and a multiple of the clip's noise
+    floor), or when it is moderately loud with a fricative-like ZCR
+    ("s", "f", "sh" are quiet but noisy) right next to voiced speech.
+    Loud frames with a noise-like ZCR (hiss, fans) are not voiced speech.
+    Detections are extended by a hangover so word endings are not clipped.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=20,
+                 energy_threshold=0.004, noise_multiplier=2.5, max_noise_floor=0.015,
+                 voiced_max_zcr=0.4, fricative_zcr=(0.25, 0.7), min_speech_ms=120,
+                 hangover_ms=150, padding_ms=100, max_pause_ms=400):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold = energy_threshold
+        self.noise_multiplier = noise_multiplier
+        self.max_noise_floor = max_noise_floor
+        self.voiced_max_zcr = voiced_max_zcr
+        self.fricative_zcr = fricative_zcr
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.hangover_frames = int(hangover_ms / frame_ms)
+        self.padding_frames = int(padding_ms / frame_ms)
+        self.max_pause_frames = max(1, int(max_pause_ms / frame_ms))
+
+        # Running totals
+        self.utterances = 0
+        self.rejected = 0
+        self.seconds_saved = 0.0
+
+    # ------------------------------------------------------------------
+    def frame_features(self, audio):
+        """Per-frame RMS energy and zero-crossing rate (partial last frame dropped)"""
+        n_frames = len(audio) // self.frame_size
+        frames = audio[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1)
+        return rms, zcr
+
+    def threshold(self, rms):
+        """Adaptive energy threshold for one clip"""
+        if len(rms) == 0:
+            return self.energy_threshold
+        noise_floor = min(float(np.percentile(rms, 10)), self.max_noise_floor)
+        return max(self.energy_threshold, noise_floor * self.noise_multiplier)
+
+    def speech_frames(self, audio):
+        """Raw (un-smoothed) boolean speech mask, one entry per frame"""
+        rms, zcr = self.frame_features(audio)
+        threshold = self.threshold(rms)
+        voiced = (rms > threshold) & (zcr < self.voiced_max_zcr)
+        low, high = self.fricative_zcr
+        fricative = (rms > threshold * 0.5) & (zcr >= low) & (zcr <= high)
+        # Fricatives only count next to voiced speech, so steady hiss is not speech
+        return voiced | (fricative & self._dilate(voiced, self.hangover_frames))
+
+    def _dilate(self, mask, frames):
+        """Extend every speech frame by `frames` on both sides"""
+        if frames <= 0 or not mask.any():
+            return mask
+        kernel = np.ones(2 * frames + 1, dtype=np.int32)
+        # "full" + slice, because "same" returns len(kernel) items for masks shorter than the kernel
+        return np.convolve(mask.astype(np.int32), kernel, mode="full")[frames:frames + len(mask)] > 0
+
+    def _runs(self, mask):
+        """(start, end) frame indices of each run of False in mask"""
+        padded = np.concatenate(([True], mask, [True]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return edges[0::2], edges[1::2]
+
+    # ------------------------------------------------------------------
+    def process(self, audio):
+        """
+        Trim a mono float32 clip down to its speech
+
+        Returns (trimmed_audio, report). trimmed_audio is None when the clip
+        holds no speech. report:
+        {
+            'speech': True/False,
+            'original_seconds': clip length,
+            'kept_seconds': length handed to Whisper,
+            'saved_seconds': original - kept,
+            'speech_seconds': frames detected as speech
+        }
+        """
+        original_seconds = len(audio) / self.sample_rate
+        raw = self.speech_frames(audio)
+        speech_count = int(np.count_nonzero(raw))
+        report = {
+            'speech': speech_count >= self.min_speech_frames,
+            'original_seconds': original_seconds,
+            'kept_seconds': 0.0,
+            'saved_seconds': original_seconds,
+            'speech_seconds': speech_count * self.frame_size / self.sample_rate
+        }
+        self.utterances += 1
+        if not report['speech']:
+            self.rejected += 1
+            return None, report
+
+        keep = self._dilate(raw, self.hangover_frames)
+        speech_at = np.flatnonzero(keep)
+        first = max(0, speech_at[0] - self.padding_frames)
+        last = min(len(keep), speech_at[-1] + 1 + self.padding_frames)
+
+        # Inside [first, last): keep speech plus at most max_pause of each pause
+        segment_keep = keep[first:last].copy()
+        pause_starts, pause_ends = self._runs(segment_keep)
+        half = self.max_pause_frames // 2
+        for start, end in zip(pause_starts, pause_ends):
+            if end - start > self.max_pause_frames:
+                segment_keep[start:end] = False
+                segment_keep[start:start + half] = True
+                segment_keep[end - (self.max_pause_frames - half):end] = True
+            else:
+                segment_keep[start:end] = True
+
+        frame_keep = np.zeros(len(keep), dtype=bool)
+        frame_keep[first:last] = segment_keep
+        sample_keep = np.repeat(frame_keep, self.frame_size)
+        trimmed = audio[:len(sample_keep)][sample_keep]
+
+        kept_seconds = len(trimmed) / self.sample_rate
+        report['kept_seconds'] = kept_seconds
+        report['saved_seconds'] = original_seconds - kept_seconds
+        self.seconds_saved += report['saved_seconds']
+        return trimmed, report
+
+
+class UtteranceDetector:
+    """
+    Live utterance endpointing for hands-free mode
+
+    feed() is called from the audio callback with every input block. It
+    only computes one RMS and one ZCR per block, so the idle cost is tiny.
+    Once `start_ms` of voiced blocks arrive, an utterance opens (including
+    `preroll_seconds` from before the trigger); it closes after
+    `end_silence_ms` of silence or at `max_seconds`, and a copy is put on
+    the `utterances` queue for the main loop. The noise floor adapts while
+    idle. feed() and reset() may be called from different threads; set
+    `enabled` to False to ignore input (e.g. while the agent is talking).
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, start_ms=120, end_silence_ms=700,
+                 max_seconds=15.0, preroll_seconds=0.3, min_rms=0.01,
+                 noise_multiplier=3.0, voiced_max_zcr=0.4, queue_size=4):
+        self.sample_rate = sample_rate
+        self.start_samples = int(sample_rate * start_ms / 1000)
+        self.end_samples = int(sample_rate * end_silence_ms / 1000)
+        self.min_rms = min_rms
+        self.noise_multiplier = noise_multiplier
+        self.voiced_max_zcr = voiced_max_zcr
+
+        self.preroll = AudioRingBuffer(sample_rate, channels, preroll_seconds, "drop_oldest")
+        self.buffer = AudioRingBuffer(sample_rate, channels, max_seconds, "drop_newest")
+        self.utterances = queue.Queue(maxsize=queue_size)
+
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.in_utterance = False
+        self.noise_floor = min_rms / noise_multiplier
+        self._speech_run = 0
+        self._silence_run = 0
+        self.detected = 0
+        self.dropped = 0
+
+    def _is_speech(self, block):
+        mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+        rms = float(np.sqrt(np.mean(np.square(mono))))
+        signs = np.signbit(mono)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / max(1, len(mono) - 1)
+        speech = rms > max(self.min_rms, self.noise_floor * self.noise_multiplier) and zcr < self.voiced_max_zcr
+        if not speech and not self.in_utterance:
+            # Slow EMA so a short loud noise does not raise the floor much
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+
+    def feed(self, block):
+        """Process one (frames, channels) input block"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._feed(block)
+
+    def _feed(self, block):
+        frames = len(block)
+        speech = self._is_speech(block)
+
+        if not self.in_utterance:
+            self.preroll.write(block)
+            self._speech_run = self._speech_run + frames if speech else 0
+            if self._speech_run >= self.start_samples:
+                self.in_utterance = True
+                self._silence_run = 0
+                self.buffer.reset()
+                self.buffer.write(self.preroll.view())
+            return
+
+        self.buffer.write(block)
+        self._silence_run = 0 if speech else self._silence_run + frames
+        if self._silence_run >= self.end_samples or self.buffer.is_full:
+            self._emit()
+
+    def _emit(self):
+        self.in_utterance = False
+        self._speech_run = 0
+        self.preroll.reset()
+        try:
+            self.utterances.put_nowait(self.buffer.view().copy())
+            self.detected += 1
+        except queue.Full:
+            # Main loop is still busy with earlier utterances
+            self.dropped += 1
+
+    def reset(self):
+        """Drop the utterance in progress and any not yet taken from the queue"""
+        with self._lock:
+            self.in_utterance = False
+            self._speech_run = 0
+            self._silence_run = 0
+            self.preroll.reset()
+            self.buffer.reset()
+            while True:
+                try:
+                    self.utterances.get_nowait()
+                except queue.Empty:
+                    break
@@ -0,0 +1,105 @@
+"""
+VOCAB BIAS - Bias Whisper decoding toward the agent's command vocabulary
+The agent only understands a few dozen command words plus the app names it
+can open. Feeding them to Whisper as the initial prompt / hotwords, with
+tight decode limits, keeps command decodes short and on-vocabulary.
+"""
+
+import re
+
+# Regex escape letters that show up as "words" in template patterns (\s, \d, \w)
+_REGEX_LETTERS = {"s", "d", "w"}
+
+
+class CommandVocabularyBias:
+    """
+    Build biased faster-whisper decode options from the command vocabulary
+
+    Sources:
+        command_templates - CommandClassifier.command_templates (pattern words + keywords)
+        phrases           - plain command phrases (for agents without a classifier)
+        app_names         - VoiceAgent.apps keys
+
+    update() rebuilds the prompt only when the vocabulary actually changed.
+    The prompt and hotwords are capped so prompt + max_new_tokens always
+    fits Whisper's 448-token decoder window.
+    """
+
+    def __init__(self, command_templates=None, phrases=(), app_names=(),
+                 max_new_tokens=48, max_prompt_chars=600, max_hotword_chars=300):
+        self.max_new_tokens = max_new_tokens
+        self.max_prompt_chars = max_prompt_chars
+        self.max_hotword_chars = max_hotword_chars
+        self.command_templates = command_templates or {}
+        self.phrases = list(phrases)
+        self.app_names = []
+        self.initial_prompt = ""
+        self.hotwords = ""
+        self.rebuilds = 0
+        self._signature = None
+        self.update(app_names=app_names)
+
+    @staticmethod
+    def _template_words(config):
+        pattern = re.sub(r"\(\?P<\w+>", "(", config["pattern"])   # group names are not spoken
+        words = [w for w in re.findall(r"[a-z]+", pattern) if w not in _REGEX_LETTERS]
+        return words + [kw for kw in config.get("keywords", []) if kw not in words]
+
+    @staticmethod
+    def _cap(items, limit, sep):
+        out, size = [], 0
+        for item in items:
+            size += len(item) + len(sep)
+            if size > limit:
+                break
+            out.append(item)
+        return sep.join(out)
+
+    def update(self, command_templates=None, app_names=None):
+        """Refresh the vocabulary; returns True if the bias was rebuilt"""
+        if command_templates is not None:
+            self.command_templates = command_templates
+        if app_names is not None:
+            self.app_names = sorted(set(name.lower() for name in app_names))
+
+        signature = (
+            tuple((name, cfg["pattern"], tuple(cfg.get("keywords", [])))
+                  for name, cfg in self.command_templates.items()),
+            tuple(self.phrases),
+            tuple(self.app_names)
+        )
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self._build()
+        self.rebuilds += 1
+        return True
+
+    def _build(self):
+        vocabulary = list(self.phrases)
+        for config in self.command_templates.values():
+            for word in self._template_words(config):
+                if word not in vocabulary:
+                    vocabulary.append(word)
+        opens = [f"open {name}" for name in self.app_names]
+        self.initial_prompt = self._cap(
+            ["Voice commands:"] + vocabulary + opens, self.max_prompt_chars, ", "
+        ).replace(":, ", ": ", 1)
+        self.hotwords = self._cap(self.app_names, self.max_hotword_chars, " ")
+
+    def apply(self, options, limits=True):
+        """
+        Return a copy of `options` with the bias and decode limits added
+
+        limits=False adds only the prompt and hotwords and keeps segment
+        timestamps (the streaming transcriber commits by segment end).
+        """
+        biased = dict(options)
+        biased.update(initial_prompt=self.initial_prompt or None, hotwords=self.hotwords or None)
+        if limits:
+            biased.update(
+                max_new_tokens=self.max_new_tokens,
+                without_timestamps=True,
+                condition_on_previous_text=False
+            )
+        return biased